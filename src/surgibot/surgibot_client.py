@@ -9,13 +9,15 @@ SurgiBot Client — PySide6 (revamped layout)
 
 import os, sys, json, argparse
 import math
+import time
+from operator import attrgetter
 from pathlib import Path
 from typing import Union, List, Dict
 from datetime import datetime, timedelta, time as dtime, date as ddate
 
 import requests
 
-from PySide6 import QtCore, QtGui, QtWidgets
+from PySide6 import QtCore, QtGui, QtNetwork, QtWidgets
 from PySide6.QtCore import QSettings, QUrl
 from PySide6.QtGui import (
     QShortcut, QKeySequence, QIcon, QPixmap, QPainter,
@@ -111,6 +113,7 @@ from PySide6.QtWebSockets import QWebSocket
 
 from .config import CONFIG
 from .logging_setup import get_logger
+from .utils import fastjson
 from .workers.io_worker import SESSION_MANAGER, NetworkTask
 
 logger = get_logger(__name__)
@@ -127,21 +130,73 @@ API_LIST   = "/api/list"
 API_LIST_FULL = "/api/list_full"
 API_WS = "/api/ws"
 
-STATUS_CHOICES = ["รอผ่าตัด", "กำลังผ่าตัด", "กำลังพักฟื้น", "กำลังส่งกลับตึก", "เลื่อนการผ่าตัด"]
+# Canonical status strings: one interned object each, shared by every table below.
+_S_WAIT = sys.intern("รอผ่าตัด")
+_S_OP = sys.intern("กำลังผ่าตัด")
+_S_RECOVERY = sys.intern("กำลังพักฟื้น")
+_S_RECOVERED = sys.intern("พักฟื้นครบแล้ว")
+_S_RETURNING = sys.intern("กำลังส่งกลับตึก")
+_S_POSTPONED = sys.intern("เลื่อนการผ่าตัด")
+
+STATUS_CHOICES = [_S_WAIT, _S_OP, _S_RECOVERY, _S_RETURNING, _S_POSTPONED]
 OR_CHOICES     = ["OR1", "OR2", "OR3", "OR4", "OR5", "OR6", "OR8"]
 QUEUE_CHOICES  = ["0-1", "0-2", "0-3", "0-4", "0-5", "0-6", "0-7"]
 
-STATUS_OP_START = "กำลังผ่าตัด"
-STATUS_OP_END = "กำลังพักฟื้น"
-STATUS_RETURNING = "กำลังส่งกลับตึก"
+# Server/websocket spellings (lower-cased) -> canonical Thai status
+STATUS_NORMALIZE: dict[str, str] = {
+    _S_WAIT: _S_WAIT, "waiting": _S_WAIT,
+    "queued": _S_WAIT, "pending": _S_WAIT,
+    _S_OP: _S_OP, "operating": _S_OP,
+    "in operation": _S_OP, "in_operation": _S_OP,
+    "in-surgery": _S_OP, "surgery": _S_OP,
+    "ongoing": _S_OP,
+    _S_RECOVERY: _S_RECOVERY, "recovery": _S_RECOVERY,
+    "pacu": _S_RECOVERY, "post-op": _S_RECOVERY,
+    "post_operation": _S_RECOVERY,
+    _S_RETURNING: _S_RETURNING, "sending back": _S_RETURNING,
+    "transfer": _S_RETURNING, "returning": _S_RETURNING,
+    _S_POSTPONED: _S_POSTPONED, "postponed": _S_POSTPONED,
+    "deferred": _S_POSTPONED, "canceled": _S_POSTPONED,
+    "cancelled": _S_POSTPONED,
+}
+STATUS_BY_INDEX = tuple(STATUS_CHOICES)
+
+_STATUS_BY_CODE = {str(i): st for i, st in enumerate(STATUS_BY_INDEX)}
+
+def _status_from_index(raw: str) -> str:
+    """Int-coded status ("0".."4"); anything else falls back to waiting."""
+    st = _STATUS_BY_CODE.get(raw)
+    if st is not None:
+        return st
+    try:
+        idx = int(raw)
+    except (TypeError, ValueError):
+        return STATUS_BY_INDEX[0]
+    return STATUS_BY_INDEX[idx] if 0 <= idx < len(STATUS_BY_INDEX) else STATUS_BY_INDEX[0]
+
+STATUS_OP_START = _S_OP
+STATUS_OP_END = _S_RECOVERY
+STATUS_RETURNING = _S_RETURNING
 
 STATUS_COLORS = {
-    "รอผ่าตัด": "#fde047",
-    "กำลังผ่าตัด": "#ef4444",
-    "กำลังพักฟื้น": "#22c55e",
-    "กำลังส่งกลับตึก": "#a855f7",
-    "เลื่อนการผ่าตัด": "#64748b",
+    _S_WAIT: "#fde047",
+    _S_OP: "#ef4444",
+    _S_RECOVERY: "#22c55e",
+    _S_RETURNING: "#a855f7",
+    _S_POSTPONED: "#64748b",
 }
+# statuses whose monitor time cell ticks (everything except waiting)
+_TIME_RELEVANT_STATUSES = frozenset({_S_OP, _S_RECOVERY, _S_RECOVERED, _S_RETURNING, _S_POSTPONED})
+# statuses drawn with white text on their status colour
+_WHITE_FG_SET = frozenset({_S_OP, _S_RETURNING, _S_POSTPONED})
+STATUS_BG_BRUSH = {st: QtGui.QBrush(QtGui.QColor(col)) for st, col in STATUS_COLORS.items()}
+STATUS_FG_BRUSH = {st: QtGui.QBrush(QtGui.QColor("#ffffff" if st in _WHITE_FG_SET else "#000000"))
+                   for st in STATUS_COLORS}
+# height of an OR header row and its card (card body + ShadowFrame margins); patient rows keep
+# the QTreeView::item QSS height, so the schedule tree cannot use uniform row heights
+OR_CARD_HEIGHT = 60
+# item-data flag on column 0; ScheduleDelegate paints the whole row highlighted while it is set
+FLASH_ROLE = QtCore.Qt.UserRole + 7
 OR_HEADER_COLORS = {
     "OR1": "#3b82f6",
     "OR2": "#10b981",
@@ -152,9 +207,13 @@ OR_HEADER_COLORS = {
     "OR8": "#64748b",
 }
 
+# ---- OR header pulse (one full sine cycle per 120 ticks) ----
+_PULSE_STEPS = 120
+_PULSE_K = tuple((1.0 + math.sin(p / _PULSE_STEPS * 2.0 * math.pi)) * 0.5 for p in range(_PULSE_STEPS))
+
 # ---- Auto purge (client-side) ----
 AUTO_PURGE_MINUTES = CONFIG.client_auto_purge_minutes
-AUTO_PURGE_STATUSES = {"กำลังส่งกลับตึก"}
+AUTO_PURGE_STATUSES = {_S_RETURNING}
 
 # ---------- Shared schedule ----------
 ORG_NAME    = "ORNBH"
@@ -178,6 +237,15 @@ def _now_period(dt_val: datetime) -> str:
 def _period_label(code: str) -> str:
     return "ในเวลาราชการ" if code == "in" else "นอกเวลาราชการ"
 
+_SCHED_SORT_KEY = attrgetter("_row_sort_key")
+
+# completeness bits cached on _SchedEntry (recomputed whenever post-op fields change)
+_DONE_TIME_START = 0b0001
+_DONE_TIME_END   = 0b0010
+_DONE_STAFF      = 0b0100
+_DONE_CLINICAL   = 0b1000
+_DONE_ALL        = 0b1111
+
 class _SchedEntry:
     def __init__(self, d: Dict):
         known_keys = {
@@ -218,6 +286,22 @@ class _SchedEntry:
             self.version = 0
         self.updated_at = str(d.get("updated_at", "") or "")
         self._extra = {k: v for k, v in d.items() if k not in known_keys}
+        self.refresh_derived()
+
+    def refresh_derived(self) -> int:
+        """Recompute the cached sort key, joined display texts and completeness mask; returns the mask."""
+        q = int(self.queue or 0)
+        self._row_sort_key = (0, q, "") if q > 0 else (1, 0, self.time or "99:99")
+        self._queue_label = str(q) if q > 0 else "ตามเวลา"
+        self._diags_str = ", ".join(self.diags) if self.diags else "-"
+        self._ops_str = ", ".join(self.ops) if self.ops else "-"
+        mask = 0
+        if self.time_start: mask |= _DONE_TIME_START
+        if self.time_end: mask |= _DONE_TIME_END
+        if self.scrub or self.circulate or self.assist1 or self.assist2: mask |= _DONE_STAFF
+        if self.ops or self.diags: mask |= _DONE_CLINICAL
+        self._completeness_mask = mask
+        return mask
 
     def uid(self) -> str:
         return f"{self.or_room}|{self.hn}|{self.time}|{self.date}"
@@ -323,10 +407,13 @@ def _fmt_td(td: timedelta) -> str:
 
 def _parse_iso(ts: str):
     if not isinstance(ts, str) or not ts: return None
+    if ts[-1] == "Z": ts = ts[:-1]
     try:
-        return datetime.fromisoformat(ts.replace("Z",""))
-    except Exception:
+        dt = datetime.fromisoformat(ts)
+    except ValueError:
         return None
+    # offset-aware stamps become local naive time so they subtract cleanly from datetime.now()
+    return dt if dt.tzinfo is None else dt.astimezone().replace(tzinfo=None)
 
 def _parse_date(date_str: str):
     if not isinstance(date_str, str):
@@ -362,6 +449,107 @@ def _parse_date(date_str: str):
         return datetime.now().date()
     return None
 
+# ---------- Monitor row normalization ----------
+_HN_KEYS = ("hn_full", "hn")
+_PID_KEYS = ("patient_id", "pid", "queue_id")
+_OR_KEYS = ("or", "or_room")
+_QUEUE_KEYS = ("queue", "q")
+_STATUS_KEYS = ("status", "state", "operation_status", "op_status")
+_TS_KEYS = ("timestamp", "ts", "updated_at", "created_at", "time")
+
+def _first(d: dict, keys: tuple):
+    """Equivalent of ``d.get(k1) or d.get(k2) or ... or ""``."""
+    for k in keys:
+        v = d.get(k)
+        if v:
+            return v
+    return ""
+
+def _coerce_eta(v) -> int | None:
+    """ETA minutes as int: ints pass through, finite floats truncate, signed decimal strings parse."""
+    if v is None:
+        return None
+    if isinstance(v, int):
+        return int(v)  # also folds bool to 0/1
+    if isinstance(v, float):
+        return int(v) if math.isfinite(v) else None
+    if isinstance(v, str):
+        t = v.strip()
+        digits = t[1:] if t[:1] in ("-", "+") else t
+        return int(t) if digits.isdecimal() else None
+    return None
+
+def _build_monitor_row(i: int, it: dict) -> dict:
+    """Normalize one API/websocket item into a monitor row dict (``i`` is its 1-based position)."""
+    hn_full = str(_first(it, _HN_KEYS)).strip()
+
+    pid = str(_first(it, _PID_KEYS)).strip()
+    if not pid:
+        or_room = str(_first(it, _OR_KEYS)).strip()
+        q = str(_first(it, _QUEUE_KEYS)).strip()
+        pid = f"{or_room}-{q}" if (or_room and q) else f"row-{i}"
+
+    status_raw = str(_first(it, _STATUS_KEYS)).strip().lower()
+    status = STATUS_NORMALIZE.get(status_raw) or _status_from_index(status_raw)
+
+    ts_val = _first(it, _TS_KEYS)
+    ts_iso = ""
+    try:
+        if isinstance(ts_val, (int, float)):
+            ts_iso = datetime.fromtimestamp(float(ts_val)).isoformat(timespec="seconds")
+        elif isinstance(ts_val, str) and ts_val.strip():
+            ts_iso = ts_val
+    except Exception:
+        ts_iso = ""
+    ts_dt = _parse_iso(ts_iso)
+    if not ts_dt:
+        ts_iso = datetime.now().isoformat(timespec="seconds")
+        ts_dt = datetime.fromisoformat(ts_iso)
+
+    eta_minutes = _coerce_eta(it.get("eta_minutes", it.get("eta", it.get("eta_min", None))))
+
+    rid = it.get("id") or (hn_full if hn_full else pid) or i
+
+    row = {
+        "id": str(rid),
+        "hn_full": hn_full if hn_full else None,
+        "patient_id": str(pid),
+        "status": status,
+        "timestamp": ts_iso,
+        "eta_minutes": eta_minutes,
+        "_ts_parsed": (ts_iso, ts_dt),
+    }
+    row["_hn_all"] = _hn_of_row(row)
+    return row
+
+def _row_ts(row: dict):
+    """Parsed ``row["timestamp"]``, cached on the row as ``(source, datetime)`` until the source changes."""
+    ts_iso = row.get("timestamp")
+    cached = row.get("_ts_parsed")
+    if cached is not None and cached[0] == ts_iso:
+        return cached[1]
+    ts = _parse_iso(ts_iso)
+    row["_ts_parsed"] = (ts_iso, ts)
+    return ts
+
+def _hn_of_row(r: dict) -> str:
+    """9-digit HN of a monitor row (from hn_full, else id), or ""."""
+    hn = str(r.get("hn_full") or "").strip()
+    if hn and hn.isdigit() and len(hn) == 9:
+        return hn
+    _id = str(r.get("id") or "").strip()
+    if _id.isdigit() and len(_id) == 9:
+        return _id
+    return ""
+
+def _row_hn(r: dict) -> str:
+    # rows from _build_monitor_row carry it precomputed; local/persisted rows are derived on the fly
+    hn = r.get("_hn_all")
+    return hn if hn is not None else _hn_of_row(r)
+
+def _persistable_row(row: dict) -> dict:
+    return {k: v for k, v in row.items() if not k.startswith("_")}
+
 # ---------- HTTP ----------
 class SurgiBotClientHTTP:
     def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, token=DEFAULT_TOKEN, timeout=DEFAULT_TIMEOUT):
@@ -383,9 +571,8 @@ class SurgiBotClientHTTP:
             if queue:   payload["queue"] = str(queue)
         if status is not None: payload["status"] = str(status)
         if hn: payload["hn"] = str(hn)
-        if eta_minutes is not None and str(eta_minutes).strip() != "":
-            try: payload["eta_minutes"] = int(eta_minutes)
-            except Exception: pass
+        eta = _coerce_eta(eta_minutes)
+        if eta is not None: payload["eta_minutes"] = eta
         r = self.sess.post(self.base + API_UPDATE, json=payload, timeout=self.timeout, headers={"Accept":"application/json"})
         try:
             data = r.json()
@@ -430,25 +617,142 @@ class SubmitError(Exception):
 class LocalTableModel:
     def __init__(self):
         self.rows, self._seq = [], 1
-    def _find(self, pid):
-        for i, r in enumerate(self.rows):
-            if r["patient_id"] == pid: return i
-        return -1
+        self._by_pid: dict[str, dict] = {}
     def add_or_edit(self, pid, status, timestamp=None, eta_minutes=None, hn=None):
-        i = self._find(pid)
-        if i >= 0:
-            self.rows[i]["status"] = status
-            if timestamp is not None: self.rows[i]["timestamp"] = timestamp
-            if eta_minutes is not None: self.rows[i]["eta_minutes"] = eta_minutes
-            if hn is not None: self.rows[i]["hn_full"] = hn
-            return self.rows[i]["id"]
+        r = self._by_pid.get(pid)
+        if r is not None:
+            r["status"] = status
+            if timestamp is not None: r["timestamp"] = timestamp
+            if eta_minutes is not None: r["eta_minutes"] = eta_minutes
+            if hn is not None: r["hn_full"] = hn
+            return r["id"]
         rid = self._seq; self._seq += 1
-        self.rows.append({"id": hn or rid, "hn_full": hn, "patient_id": pid, "status": status,
-                          "timestamp": timestamp, "eta_minutes": eta_minutes})
+        r = {"id": hn or rid, "hn_full": hn, "patient_id": pid, "status": status,
+             "timestamp": timestamp, "eta_minutes": eta_minutes}
+        self.rows.append(r); self._by_pid[pid] = r
         return rid
     def delete(self, pid):
-        i = self._find(pid)
-        if i >= 0: self.rows.pop(i)
+        r = self._by_pid.pop(pid, None)
+        if r is not None: self.rows.remove(r)
+
+# ---------- Monitor table model ----------
+class MonitorTableModel(QtCore.QAbstractTableModel):
+    """Read-only view over the visible monitor rows (list of dicts from _extract_rows)."""
+
+    HEADERS = ("ID", "รหัสผู้ป่วย (Patient ID)", "สถานะ (Status)", "เวลา (Elapsed / เวลาคาดเสร็จ)")
+    TIME_COL = 3
+
+    def __init__(self, time_text, parent=None):
+        super().__init__(parent)
+        self._rows: list[dict] = []
+        self._ids: list[str] = []
+        self._sigs: list[tuple] = []
+        self._time_text = time_text
+        self._now = datetime.now()  # one clock reading shared by every time cell of a tick
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        r = self._rows[index.row()]
+        col = index.column()
+        if role == QtCore.Qt.DisplayRole:
+            if col == 0: return str(r.get("id", ""))
+            if col == 1: return str(r.get("patient_id", ""))
+            if col == 2: return str(r.get("status", ""))
+            return self._time_text(r, self._now) if r.get("status") in _TIME_RELEVANT_STATUSES else ""
+        if col == 2:
+            if role == QtCore.Qt.BackgroundRole:
+                return STATUS_BG_BRUSH.get(r.get("status", ""))
+            if role == QtCore.Qt.ForegroundRole:
+                return STATUS_FG_BRUSH.get(r.get("status", ""))
+        return None
+
+    def row_at(self, i: int) -> dict | None:
+        return self._rows[i] if 0 <= i < len(self._rows) else None
+
+    @staticmethod
+    def _row_id(r: dict) -> str:
+        return str(r.get("id", ""))
+
+    @staticmethod
+    def _row_sig(r: dict) -> tuple:
+        # values behind columns 0-2; rows from LocalTableModel are mutated in place, so keep a copy
+        return (r.get("id"), r.get("patient_id"), r.get("status"))
+
+    def set_rows(self, rows: list[dict]):
+        """Diff *rows* against the current contents by id and signal only the affected rows."""
+        rows = list(rows)
+        new_ids = [self._row_id(r) for r in rows]
+        if new_ids != self._ids and not self._restructure(rows, new_ids):
+            self.beginResetModel()
+            self._rows, self._ids = rows, new_ids
+            self._sigs = [self._row_sig(r) for r in rows]
+            self.endResetModel()
+            return
+        last = self.TIME_COL
+        for i, r in enumerate(rows):
+            self._rows[i] = r
+            sig = self._row_sig(r)
+            if sig != self._sigs[i]:
+                self._sigs[i] = sig
+                self.dataChanged.emit(self.index(i, 0), self.index(i, last))
+
+    def _restructure(self, rows: list[dict], new_ids: list[str]) -> bool:
+        """Remove/insert rows so the id sequence matches *new_ids*; False if rows were reordered."""
+        new_set = set(new_ids)
+        if len(new_set) != len(new_ids):
+            return False
+        root = QtCore.QModelIndex()
+        # contiguous runs go out/in with one begin/end pair each
+        i = len(self._ids) - 1
+        while i >= 0:
+            if self._ids[i] in new_set:
+                i -= 1
+                continue
+            j = i
+            while j > 0 and self._ids[j - 1] not in new_set:
+                j -= 1
+            self.beginRemoveRows(root, j, i)
+            del self._rows[j:i + 1], self._ids[j:i + 1], self._sigs[j:i + 1]
+            self.endRemoveRows()
+            i = j - 1
+        kept = set(self._ids)
+        j = 0
+        while j < len(new_ids):
+            if j < len(self._ids) and self._ids[j] == new_ids[j]:
+                j += 1
+                continue
+            if new_ids[j] in kept:
+                return False
+            k = j
+            while k < len(new_ids) and new_ids[k] not in kept:
+                k += 1
+            self.beginInsertRows(root, j, k - 1)
+            self._rows[j:j] = rows[j:k]
+            self._ids[j:j] = new_ids[j:k]
+            self._sigs[j:j] = [self._row_sig(r) for r in rows[j:k]]
+            self.endInsertRows()
+            j = k
+        return True
+
+    def refresh_time_column(self, now: datetime | None = None):
+        """Repaint the elapsed-time cells, limited to the span of rows whose status has a timer."""
+        self._now = now or datetime.now()
+        ticking = [i for i, r in enumerate(self._rows) if r.get("status") in _TIME_RELEVANT_STATUSES]
+        if ticking:
+            self.dataChanged.emit(self.index(ticking[0], self.TIME_COL), self.index(ticking[-1], self.TIME_COL),
+                                  [QtCore.Qt.DisplayRole])
 
 # ---------- UI helpers ----------
 class FlowLayout(QtWidgets.QLayout):
@@ -583,9 +887,6 @@ class ShadowButton(QtWidgets.QPushButton):
 class PostOpDialog(QtWidgets.QDialog):
     def __init__(self, entry: _SchedEntry, parent: QtWidgets.QWidget | None = None):
         super().__init__(parent)
-        self.entry = entry
-        self.specialty_key = (entry.dept or "Surgery").strip() or "Surgery"
-        self.setWindowTitle(f"บันทึกหลังผ่าตัด — HN {entry.hn}")
         layout = QtWidgets.QVBoxLayout(self)
         layout.setContentsMargins(12, 12, 12, 12)
         layout.setSpacing(12)
@@ -596,50 +897,34 @@ class PostOpDialog(QtWidgets.QDialog):
 
         grid.addWidget(QtWidgets.QLabel("Assist 1"), 0, 0)
         self.assist1 = make_search_combo(SCRUB_NURSES)
-        self.assist1.setEditText(entry.assist1)
         grid.addWidget(self.assist1, 0, 1)
 
         grid.addWidget(QtWidgets.QLabel("Assist 2"), 0, 2)
         self.assist2 = make_search_combo(SCRUB_NURSES)
-        self.assist2.setEditText(entry.assist2)
         grid.addWidget(self.assist2, 0, 3)
 
         grid.addWidget(QtWidgets.QLabel("Scrub"), 1, 0)
         self.scrub = make_search_combo(SCRUB_NURSES)
-        self.scrub.setEditText(entry.scrub)
         grid.addWidget(self.scrub, 1, 1)
 
         grid.addWidget(QtWidgets.QLabel("Circulate"), 1, 2)
         self.circulate = make_search_combo(SCRUB_NURSES)
-        self.circulate.setEditText(entry.circulate)
         grid.addWidget(self.circulate, 1, 3)
 
         row = 2
         op_label = QtWidgets.QLabel("Operation (หลังผ่าตัด)")
         grid.addWidget(op_label, row, 0, 1, 4)
         row += 1
-        self.op_adder = SearchSelectAdder(
-            "ค้นหา/เลือก Operation...",
-            suggestions=operation_suggestions(self.specialty_key),
-        )
-        for op_text in (entry.ops or []):
-            self.op_adder.list.addItem(op_text)
+        self.op_adder = SearchSelectAdder("ค้นหา/เลือก Operation...", suggestions=[])
         grid.addWidget(self.op_adder, row, 0, 1, 4)
         row += 1
 
         dx_label = QtWidgets.QLabel("Diagnosis (หลังผ่าตัด)")
         grid.addWidget(dx_label, row, 0, 1, 4)
         row += 1
-        self.dx_adder = SearchSelectAdder(
-            "ค้นหา ICD-10 ...",
-            suggestions=diagnosis_suggestions(self.specialty_key, entry.ops or []),
-        )
-        for dx_text in (entry.diags or []):
-            self.dx_adder.list.addItem(dx_text)
+        self.dx_adder = SearchSelectAdder("ค้นหา ICD-10 ...", suggestions=[])
         grid.addWidget(self.dx_adder, row, 0, 1, 4)
 
-        self.op_adder.itemsChanged.connect(self._refresh_dx_suggest)
-
         layout.addLayout(grid)
 
         btn = QtWidgets.QPushButton("💾 บันทึกหลังผ่าตัด")
@@ -647,6 +932,33 @@ class PostOpDialog(QtWidgets.QDialog):
         btn.clicked.connect(self.accept)
         layout.addWidget(btn, 0, QtCore.Qt.AlignRight)
 
+        self.load_entry(entry)
+        self.op_adder.itemsChanged.connect(self._refresh_dx_suggest)
+
+    def load_entry(self, entry: _SchedEntry):
+        """Bind the dialog to *entry*; the widgets are built once and reused between opens."""
+        self.entry = entry
+        self.specialty_key = (entry.dept or "Surgery").strip() or "Surgery"
+        self.setWindowTitle(f"บันทึกหลังผ่าตัด — HN {entry.hn}")
+        self.assist1.setEditText(entry.assist1)
+        self.assist2.setEditText(entry.assist2)
+        self.scrub.setEditText(entry.scrub)
+        self.circulate.setEditText(entry.circulate)
+
+        was_blocked = self.op_adder.blockSignals(True)
+        try:
+            self.op_adder.set_suggestions(operation_suggestions(self.specialty_key))
+            self.op_adder.list.clear()
+            for op_text in (entry.ops or []):
+                self.op_adder.list.addItem(op_text)
+        finally:
+            self.op_adder.blockSignals(was_blocked)
+
+        self.dx_adder.set_suggestions(diagnosis_suggestions(self.specialty_key, entry.ops or []))
+        self.dx_adder.list.clear()
+        for dx_text in (entry.diags or []):
+            self.dx_adder.list.addItem(dx_text)
+
     def _refresh_dx_suggest(self, _items: list[str]):
         suggestions = diagnosis_suggestions(self.specialty_key, self.op_adder.items())
         self.dx_adder.set_suggestions(suggestions)
@@ -732,6 +1044,71 @@ def _rgba(hex_color: str, a: float) -> str:
     c = QColor(hex_color)
     return f"rgba({c.red()},{c.green()},{c.blue()},{a})"
 
+# ---------- Prebaked shadows ----------
+def _shadow_tile(radius: int, blur: int, color: QColor) -> QPixmap:
+    """Blurred rounded-rect tile, rendered once and shared through QPixmapCache."""
+    key = f"shadow-{radius}-{blur}-{color.rgba():08x}"
+    cached = QtGui.QPixmapCache.find(key)
+    if cached is not None and not cached.isNull():
+        return cached
+    side = 2 * (blur + radius) + 1
+    src = QtGui.QImage(side, side, QtGui.QImage.Format_ARGB32_Premultiplied); src.fill(QtCore.Qt.transparent)
+    p = QPainter(src); p.setRenderHint(QPainter.Antialiasing, True); p.setPen(QtCore.Qt.NoPen); p.setBrush(color)
+    p.drawRoundedRect(QtCore.QRectF(blur, blur, side - 2 * blur, side - 2 * blur), radius, radius); p.end()
+
+    scene = QtWidgets.QGraphicsScene()
+    item = scene.addPixmap(QPixmap.fromImage(src))
+    effect = QtWidgets.QGraphicsBlurEffect(); effect.setBlurRadius(blur); item.setGraphicsEffect(effect)
+    out = QtGui.QImage(side, side, QtGui.QImage.Format_ARGB32_Premultiplied); out.fill(QtCore.Qt.transparent)
+    p = QPainter(out); scene.render(p, QtCore.QRectF(0, 0, side, side), QtCore.QRectF(0, 0, side, side)); p.end()
+
+    pm = QPixmap.fromImage(out)
+    QtGui.QPixmapCache.insert(key, pm)
+    return pm
+
+def _draw_shadow(painter: QPainter, rect: QtCore.QRect, radius: int, blur: int, color: QColor):
+    """Blit the cached tile around *rect* as a 9-slice: fixed corners, stretched edges."""
+    pm = _shadow_tile(radius, blur, color)
+    c = blur + radius
+    outer = rect.adjusted(-blur, -blur, blur, blur)
+    xs = (outer.left(), outer.left() + c, outer.right() + 1 - c, outer.right() + 1)
+    ys = (outer.top(), outer.top() + c, outer.bottom() + 1 - c, outer.bottom() + 1)
+    src = (0, c, c + 1, 2 * c + 1)
+    for i in range(3):
+        for j in range(3):
+            target = QtCore.QRect(xs[i], ys[j], xs[i + 1] - xs[i], ys[j + 1] - ys[j])
+            if target.width() <= 0 or target.height() <= 0:
+                continue
+            painter.drawPixmap(target, pm, QtCore.QRect(src[i], src[j], src[i + 1] - src[i], src[j + 1] - src[j]))
+
+class ShadowFrame(QtWidgets.QFrame):
+    """QFrame that paints a prebaked drop shadow into its own margins (no per-paint blur effect)."""
+
+    def __init__(self, radius: int = 12, blur: int = 8, y_offset: int = 3,
+                 color: QColor | None = None, parent=None):
+        super().__init__(parent)
+        self._shadow_radius = radius
+        self._shadow_blur = blur
+        self._shadow_y = y_offset
+        self._shadow_color = color or QColor(15, 23, 42, 48)
+
+    def shadow_margins(self) -> QtCore.QMargins:
+        b, y = self._shadow_blur, self._shadow_y
+        return QtCore.QMargins(b, max(0, b - y), b, b + y)
+
+    def content_rect(self) -> QtCore.QRect:
+        return self.rect().marginsRemoved(self.shadow_margins())
+
+    def paint_shadow(self, painter: QPainter):
+        rect = self.content_rect().translated(0, self._shadow_y)
+        _draw_shadow(painter, rect, self._shadow_radius, self._shadow_blur, self._shadow_color)
+
+    def paintEvent(self, event: QtGui.QPaintEvent):
+        painter = QPainter(self)
+        self.paint_shadow(painter)
+        painter.end()
+        super().paintEvent(event)
+
 class ElevatedCard(QtWidgets.QFrame):
     def __init__(self, title: str, icon: str = "📦",
                  accent: str = "#2563eb", bg: str = "#ffffff",
@@ -787,6 +1164,12 @@ class ScheduleDelegate(QtWidgets.QStyledItemDelegate):
     def __init__(self, tree: QtWidgets.QTreeWidget):
         super().__init__(tree)
         self._tree = tree
+        self._flash_brush = QtGui.QBrush(QtGui.QColor(0xFE, 0xF0, 0x8A))
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        if index.siblingAtColumn(0).data(FLASH_ROLE):
+            option.backgroundBrush = self._flash_brush
 
     def paint(self, painter, option, index):
         super().paint(painter, option, index)
@@ -863,21 +1246,18 @@ class HeroBanner(QtWidgets.QFrame):
         self.logoLabel.setPixmap(canvas)
 
 
-class WaveBanner(QtWidgets.QFrame):
+class WaveBanner(ShadowFrame):
     def __init__(self, parent=None):
-        super().__init__(parent)
+        super().__init__(radius=14, blur=10, y_offset=4, color=QtGui.QColor(15, 23, 42, 40), parent=parent)
         self.setObjectName("WaveBanner")
-        self.setMinimumHeight(90)
+        sm = self.shadow_margins()
+        self.setMinimumHeight(90 + sm.top() + sm.bottom())
         self._t = 0.0
 
         self._timer = QtCore.QTimer(self)
         self._timer.timeout.connect(self._tick)
         self._timer.start(16)
 
-        shadow = QtWidgets.QGraphicsDropShadowEffect(blurRadius=24, xOffset=0, yOffset=8)
-        shadow.setColor(QtGui.QColor(15, 23, 42, 40))
-        self.setGraphicsEffect(shadow)
-
         self.setStyleSheet(
             """
             #WaveBanner {
@@ -903,7 +1283,7 @@ class WaveBanner(QtWidgets.QFrame):
         )
 
         lay = QtWidgets.QHBoxLayout(self)
-        lay.setContentsMargins(18, 12, 18, 14)
+        lay.setContentsMargins(18 + sm.left(), 12 + sm.top(), 18 + sm.right(), 14 + sm.bottom())
         lay.setSpacing(12)
 
         logo = QtWidgets.QLabel()
@@ -930,10 +1310,12 @@ class WaveBanner(QtWidgets.QFrame):
         lay.addStretch(1)
 
         self._pill_base = "background:#ffffff;border:1px solid #e5e7eb;border-radius:10px;padding:4px 10px;font-weight:600;"
+        self._pill_online = f"{self._pill_base}color:#16a34a;"
+        self._pill_offline = f"{self._pill_base}color:#ef4444;"
 
         self.status_label = QtWidgets.QLabel("  • Offline  ")
         self.status_label.setObjectName("Pill")
-        self.status_label.setStyleSheet(f"{self._pill_base}color:#ef4444;")
+        self.status_label.setStyleSheet(self._pill_offline)
 
         self.btn_reconnect = QtWidgets.QPushButton("Reconnect")
         self.btn_reconnect.setObjectName("Reconnect")
@@ -945,16 +1327,17 @@ class WaveBanner(QtWidgets.QFrame):
         for w in (self.status_label, self.btn_reconnect, self.btn_health, self.btn_settings):
             lay.addWidget(w)
 
-    def pill_base_style(self) -> str:
-        return self._pill_base
+    def pill_style(self, ok: bool) -> str:
+        return self._pill_online if ok else self._pill_offline
 
     def _tick(self):
         self._t += 0.03
         self.update()
 
     def paintEvent(self, event: QtGui.QPaintEvent):
-        r = self.rect()
+        r = self.content_rect()
         painter = QtGui.QPainter(self)
+        self.paint_shadow(painter)
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
 
         path = QtGui.QPainterPath()
@@ -991,7 +1374,12 @@ class WaveBanner(QtWidgets.QFrame):
 class Main(QtWidgets.QWidget):
     def __init__(self, host, port, token):
         super().__init__()
+        # built in _build_ui; declared up front so hot paths can test them directly
+        self.tree_sched: QtWidgets.QTreeWidget | None = None
+        self.table: QtWidgets.QTableView | None = None
+        self._orSticky: QtWidgets.QWidget | None = None
         self.cli = SurgiBotClientHTTP(host, port, token)
+        SESSION_MANAGER.warmup(self.cli.base + API_HEALTH, timeout=self.cli.timeout)
         self.model = LocalTableModel()
         self.rows_cache = []
         self.sched = SharedScheduleModel()
@@ -1000,19 +1388,41 @@ class Main(QtWidgets.QWidget):
         self.tray = None
         self._last_states = {}
         self._last_selected_uid = ""
+        self._uid_to_item: dict[str, QtWidgets.QTreeWidgetItem] = {}
+        self._or_items: dict[str, QtWidgets.QTreeWidgetItem] = {}
+        self._sched_items: dict[str, QtWidgets.QTreeWidgetItem] = {}
+        self._row_state: dict[str, tuple] = {}  # key -> (entry, version, rendered texts)
+        self._sched_columns_frozen = False
+        self._postop_dlg: PostOpDialog | None = None
+        self._last_click_uid: str | None = None
+        self._last_click_ts = 0.0
         self._suppress_status_change = False
         self.toast = SimpleToast(self)
         self._thread_pool = QtCore.QThreadPool.globalInstance()
+        self._nam = QtNetwork.QNetworkAccessManager(self)
+        self._health_inflight = False
         self._refresh_timer = QtCore.QTimer(self)
         self._refresh_timer.setSingleShot(True)
         self._refresh_timer.timeout.connect(self._start_refresh_task)
         self._refresh_inflight = False
         self._refresh_requested = False
+        # WS pushes and HTTP refreshes share one rebuild window; only the latest rows are applied
+        self._pending_rows: list | None = None
+        self._rebuild_timer = QtCore.QTimer(self)
+        self._rebuild_timer.setSingleShot(True)
+        self._rebuild_timer.setInterval(80)
+        self._rebuild_timer.timeout.connect(self._do_rebuild)
+        self._pending_persist_rows: List[dict] | None = None
+        self._persist_timer = QtCore.QTimer(self)
+        self._persist_timer.setSingleShot(True)
+        self._persist_timer.setInterval(2000)
+        self._persist_timer.timeout.connect(self._do_persist_now)
 
         # Monitor knowledge
         self.monitor_ready = False
         self._was_in_monitor: set[str] = set()
         self._current_monitor_hn: set[str] = set()
+        self._sched_render_key: tuple | None = None
 
         self.setWindowTitle("SurgiBot Client — Modern (PySide6)")
         self.resize(1440, 900)
@@ -1027,14 +1437,14 @@ class Main(QtWidgets.QWidget):
             self._rebuild(self.rows_cache)
 
         # Barcode
-        self.scan_enabled = True; self._scan_buf = ""; self._scan_timeout_ms = 120
+        self.scan_enabled = True; self._scan_buf: list[str] = []; self._scan_timeout_ms = 120
         self._scan_timer = QtCore.QTimer(self); self._scan_timer.setSingleShot(True); self._scan_timer.timeout.connect(self._finalize_scan_if_any)
         self.installEventFilter(self)
 
         self._ensure_tray()
         self._refresh(prefer_server=True)
 
-        self._tick = QtCore.QTimer(self); self._tick.timeout.connect(lambda: self._rebuild(self.rows_cache)); self._tick.start(1000)
+        self._tick = QtCore.QTimer(self); self._tick.timeout.connect(self._refresh_monitor_view); self._tick.start(1000)
         self._pull = QtCore.QTimer(self); self._pull.timeout.connect(lambda: self._refresh(True)); self._pull.start(CONFIG.client_refresh_interval_ms)
         self._sched_timer = QtCore.QTimer(self); self._sched_timer.timeout.connect(self._check_schedule_seq); self._sched_timer.start(1000)
         self._start_websocket()
@@ -1100,19 +1510,21 @@ class Main(QtWidgets.QWidget):
         return text
 
     def _or_card_widget(self, title: str, accent: str) -> QtWidgets.QWidget:
-        w = QtWidgets.QFrame(); w.setObjectName("OrCard")
+        w = ShadowFrame(radius=12, blur=8, y_offset=3, color=QtGui.QColor(15, 23, 42, 48)); w.setObjectName("OrCard")
+        sm = w.shadow_margins()
         c = QtGui.QColor(accent)
         dark = c.darker(130).name(); mid = c.name(); bar = c.lighter(110).name()
         w.setStyleSheet(f"""
         QFrame#OrCard {{
             background: qlineargradient(x1:0,y1:0, x2:0,y2:1, stop:0 {dark}, stop:1 {mid});
             border-radius: 12px; border: 1px solid rgba(255,255,255,0.20);
+            margin: {sm.top()}px {sm.right()}px {sm.bottom()}px {sm.left()}px;
         }}
         QLabel[role="or-title"] {{ color:#fff; font-weight:900; font-size:15px; }}
         QLabel[role="or-sub"]   {{ color:rgba(255,255,255,0.90); font-weight:600; font-size:11px; }}
         """)
         w.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
-        w.setMinimumHeight(44)
+        w.setFixedHeight(OR_CARD_HEIGHT)
         lay = QtWidgets.QHBoxLayout(w); lay.setContentsMargins(12, 8, 12, 8); lay.setSpacing(10)
         barf = QtWidgets.QFrame(); barf.setFixedWidth(6); barf.setStyleSheet(f"background:{bar}; border-radius:3px;")
         lay.addWidget(barf, 0, QtCore.Qt.AlignVCenter)
@@ -1121,8 +1533,6 @@ class Main(QtWidgets.QWidget):
         lbl.setMinimumWidth(140); lbl.setAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
         sub = QtWidgets.QLabel("ห้องผ่าตัด"); sub.setProperty("role", "or-sub"); sub.setWordWrap(False); sub.setAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
         box.addWidget(lbl); box.addWidget(sub); lay.addLayout(box, 1)
-        shadow = QtWidgets.QGraphicsDropShadowEffect(w); shadow.setBlurRadius(24); shadow.setXOffset(0); shadow.setYOffset(8); shadow.setColor(QtGui.QColor(15, 23, 42, 48))
-        w.setGraphicsEffect(shadow)
         return w
 
     def _style_or_group_header(self, item: QtWidgets.QTreeWidgetItem, bg_hex: str = "#eef2ff"):
@@ -1133,14 +1543,14 @@ class Main(QtWidgets.QWidget):
             fg = QtGui.QBrush(QtGui.QColor("#1e293b")); bg = QtGui.QBrush(QtGui.QColor(bg_hex))
             for c in range(cols):
                 item.setFont(c, f); item.setForeground(c, fg); item.setBackground(c, bg)
-            item.setSizeHint(0, QtCore.QSize(item.sizeHint(0).width(), 34))
+            item.setSizeHint(0, QtCore.QSize(item.sizeHint(0).width(), OR_CARD_HEIGHT))
         except Exception:
             pass
 
     # ------ Header pulse helpers ------
     def _ensure_sched_pulser(self):
         if hasattr(self, "_sched_pulser"): return
-        self._sched_pulser = {"items": [], "phase": 0}
+        self._sched_pulser = {"items": [], "phase": 0, "alpha": -1}
         self._sched_timer2 = QtCore.QTimer(self)
         self._sched_timer2.timeout.connect(self._tick_sched_pulse)
         self._sched_timer2.start(60)
@@ -1148,6 +1558,7 @@ class Main(QtWidgets.QWidget):
     def _clear_sched_pulser(self):
         if hasattr(self, "_sched_pulser"):
             self._sched_pulser["items"].clear()
+            self._sched_pulser["alpha"] = -1
 
     def _register_or_header_for_pulse(self, item: QtWidgets.QTreeWidgetItem, color_hex: str):
         self._ensure_sched_pulser()
@@ -1155,12 +1566,16 @@ class Main(QtWidgets.QWidget):
         f = self.tree_sched.font(); f.setBold(True); item.setFont(0, f)
         item.setForeground(0, QtGui.QBrush(base.darker(140)))
         self._sched_pulser["items"].append((item, base))
+        self._sched_pulser["alpha"] = -1
 
     def _tick_sched_pulse(self):
         if not hasattr(self, "_sched_pulser"): return
-        import math
-        self._sched_pulser["phase"] = (self._sched_pulser["phase"] + 1) % 120
-        k = (1.0 + math.sin(self._sched_pulser["phase"] / 120.0 * 2.0 * math.pi)) * 0.5
+        phase = (self._sched_pulser["phase"] + 1) % _PULSE_STEPS
+        self._sched_pulser["phase"] = phase
+        alpha = int(40 + _PULSE_K[phase] * 80)
+        if alpha == self._sched_pulser["alpha"]:
+            return  # near the crest/trough consecutive phases quantize to the same alpha
+        self._sched_pulser["alpha"] = alpha
         alive_items = []
         for item, base in list(self._sched_pulser["items"]):
             try:
@@ -1169,7 +1584,7 @@ class Main(QtWidgets.QWidget):
                 continue
             if item.treeWidget() is None:
                 continue
-            bg = QtGui.QColor(base); bg.setAlpha(int(40 + k * 80))
+            bg = QtGui.QColor(base); bg.setAlpha(alpha)
             brush = QtGui.QBrush(bg)
             try:
                 for c in range(self.tree_sched.columnCount()):
@@ -1182,26 +1597,20 @@ class Main(QtWidgets.QWidget):
 
     # ----------- Monitor helpers -----------
     def _extract_hn_from_row(self, r: dict) -> str:
-        hn = str(r.get("hn_full") or "").strip()
-        if hn and hn.isdigit() and len(hn) == 9:
-            return hn
-        _id = str(r.get("id") or "").strip()
-        if _id.isdigit() and len(_id) == 9:
-            return _id
-        return ""
+        return _hn_of_row(r)
 
     def _is_hn_in_monitor(self, hn: str) -> bool:
         if not hn: return False
         return hn in self._current_monitor_hn
 
-    def _should_auto_purge(self, row: dict) -> bool:
+    def _should_auto_purge(self, row: dict, now: datetime | None = None) -> bool:
         st = str(row.get("status") or "")
         if st not in AUTO_PURGE_STATUSES:
             return False
-        ts = _parse_iso(row.get("timestamp"))
+        ts = _row_ts(row)
         if not ts:
             return False
-        return (datetime.now() - ts) >= timedelta(minutes=AUTO_PURGE_MINUTES)
+        return ((now or datetime.now()) - ts) >= timedelta(minutes=AUTO_PURGE_MINUTES)
 
     # ----------- UI reactions -----------
     def _on_sched_item_clicked_from_selection(self):
@@ -1218,6 +1627,13 @@ class Main(QtWidgets.QWidget):
 
             hn = (item.text(3) or "").strip()
             entry = item.data(0, QtCore.Qt.UserRole)
+            # a single click fires itemSelectionChanged and itemClicked back to back
+            now = time.monotonic()
+            click_uid = entry.uid() if isinstance(entry, _SchedEntry) else hn
+            if click_uid == self._last_click_uid and now - self._last_click_ts < 0.1:
+                return
+            self._last_click_uid = click_uid
+            self._last_click_ts = now
             if hn and hn.isdigit() and len(hn) == 9:
                 self.ent_hn.setText(hn)
 
@@ -1258,7 +1674,7 @@ class Main(QtWidgets.QWidget):
         return lbl
 
     def _autofit_schedule_columns(self):
-        tree = getattr(self, "tree_sched", None)
+        tree = self.tree_sched
         if tree is None:
             return
         hdr = tree.header()
@@ -1286,7 +1702,9 @@ class Main(QtWidgets.QWidget):
     def _build_header_frame(self) -> QtWidgets.QFrame:
         banner = WaveBanner(self)
         self.status_chip = banner.status_label
-        self._status_pill_base = banner.pill_base_style()
+        self._pill_online_qss = banner.pill_style(True)
+        self._pill_offline_qss = banner.pill_style(False)
+        self._chip_qss: str | None = None
         self.btn_reconnect = banner.btn_reconnect
         self.btn_health = banner.btn_health
         self.btn_settings = banner.btn_settings
@@ -1305,7 +1723,7 @@ class Main(QtWidgets.QWidget):
             QWidget { font-family:'Segoe UI','Inter','Noto Sans',system-ui; font-size:12pt; color:#0f172a; }
             QComboBox, QLineEdit { padding:5px 8px; border-radius:8px; border:1px solid #e5e7eb; background:#f8fafc; min-height:32px; }
             QHeaderView::section { background:#f1f5f9; border:none; padding:6px; font-weight:700; color:#0f172a; }
-            QTableWidget { background:white; border:1px solid #e6e6ef; border-radius:12px; gridline-color:#e6e6ef; selection-background-color:#e0f2fe; }
+            QTableView { background:white; border:1px solid #e6e6ef; border-radius:12px; gridline-color:#e6e6ef; selection-background-color:#e0f2fe; }
             QTableView::item { height:34px; } QTreeView::item { height:34px; }
         """)
 
@@ -1473,7 +1891,15 @@ QCheckBox { color:#0f172a; }
             self.action_group.addButton(btn)
 
         self.rb_add.setChecked(True)
-        for btn in (self.rb_add, self.rb_edit, self.rb_del):
+        # (checked, unchecked) stylesheet per action button, built once
+        self._action_qss: dict[QtWidgets.QPushButton, tuple[str, str]] = {}
+        for btn, color in ((self.rb_add, "#10b981"), (self.rb_edit, "#3b82f6"), (self.rb_del, "#f43f5e")):
+            self._action_qss[btn] = (
+                f"QPushButton{{padding:6px 12px;border:1px solid {color};background:{color};color:#fff;font-weight:800;}}"
+                f"QPushButton:hover{{background:{color};}}",
+                "QPushButton{padding:6px 12px;border:1px solid #e5e7eb;background:#f8fafc;color:#0f172a;font-weight:800;}"
+                "QPushButton:hover{background:#eef2f7;}",
+            )
             btn.toggled.connect(self._update_action_styles)
 
         self.btn_send = ShadowButton("🚀 ส่งคำสั่ง", "#10b981")
@@ -1575,11 +2001,17 @@ QLabel { color:#fff; font-weight: 900; }
         sticky_layout.setContentsMargins(12, 6, 12, 6)
         self._orStickyLabel = QtWidgets.QLabel("OR")
         sticky_layout.addWidget(self._orStickyLabel)
-
-        self.tree_sched.verticalScrollBar().valueChanged.connect(self._update_or_sticky)
-        self.tree_sched.horizontalScrollBar().valueChanged.connect(self._update_or_sticky)
-        self.tree_sched.itemExpanded.connect(lambda *_: self._update_or_sticky())
-        self.tree_sched.itemCollapsed.connect(lambda *_: self._update_or_sticky())
+        self._last_sticky_key: tuple[str, int] | None = None
+
+        # Throttle scroll/expand bursts to one sticky update per frame (trailing edge keeps the final position).
+        self._sticky_timer = QtCore.QTimer(self)
+        self._sticky_timer.setSingleShot(True)
+        self._sticky_timer.setInterval(16)
+        self._sticky_timer.timeout.connect(self._update_or_sticky)
+        self.tree_sched.verticalScrollBar().valueChanged.connect(self._schedule_or_sticky)
+        self.tree_sched.horizontalScrollBar().valueChanged.connect(self._schedule_or_sticky)
+        self.tree_sched.itemExpanded.connect(self._schedule_or_sticky)
+        self.tree_sched.itemCollapsed.connect(self._schedule_or_sticky)
         self.tree_sched.viewport().installEventFilter(self)
 
         # Monitor
@@ -1588,15 +2020,18 @@ QLabel { color:#fff; font-weight: 900; }
             icon="📺", accent="#8b5cf6", bg="#ffffff", header_bg=_rgba("#8b5cf6", 0.12)
         )
         gt = self.card_table.grid(); gt.setContentsMargins(0,0,0,0)
-        self.table = QtWidgets.QTableWidget(0,4)
+        self.table = QtWidgets.QTableView()
+        self.monitor_model = MonitorTableModel(self._render_time_cell, self)
+        self.table.setModel(self.monitor_model)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
         self.table.setWordWrap(False); self.table.setItemDelegate(ElideDelegate(QtCore.Qt.ElideRight, self.table))
-        self.table.setHorizontalHeaderLabels(["ID","รหัสผู้ป่วย (Patient ID)","สถานะ (Status)","เวลา (Elapsed / เวลาคาดเสร็จ)"])
         th = self.table.horizontalHeader(); th.setStretchLastSection(True); th.setDefaultAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
         for col,mode in [(0,QtWidgets.QHeaderView.ResizeToContents),(1,QtWidgets.QHeaderView.Stretch),(2,QtWidgets.QHeaderView.ResizeToContents),(3,QtWidgets.QHeaderView.ResizeToContents)]:
             th.setSectionResizeMode(col, mode)
         self.table.verticalHeader().setDefaultSectionSize(34)
         gt.addWidget(self.table,1,0,1,1)
-        self.table.itemSelectionChanged.connect(self._on_table_select)
+        self.table.selectionModel().selectionChanged.connect(self._on_table_select)
 
         # Tabs
         self.tabs.addTab(self.card_sched, "Result Schedule Patient")
@@ -1611,15 +2046,12 @@ QLabel { color:#fff; font-weight: 900; }
 
     # ---------- Helper styles ----------
     def _update_action_styles(self):
-        pal = { self.rb_add:"#10b981", self.rb_edit:"#3b82f6", self.rb_del:"#f43f5e" }
-        for btn, color in pal.items():
-            btn.setStyleSheet(
-                f"QPushButton{{padding:6px 12px;border:1px solid "
-                f"{color if btn.isChecked() else '#e5e7eb'};"
-                f"background:{color if btn.isChecked() else '#f8fafc'};"
-                f"color:{'#fff' if btn.isChecked() else '#0f172a'};font-weight:800;}}"
-                f"QPushButton:hover{{background:{color if btn.isChecked() else '#eef2f7'};}}"
-            )
+        for btn, (checked_qss, unchecked_qss) in self._action_qss.items():
+            checked = btn.isChecked()
+            if btn.property("lastChecked") == checked:
+                continue  # unchanged; skip the QSS re-parse/re-polish
+            btn.setProperty("lastChecked", checked)
+            btn.setStyleSheet(checked_qss if checked else unchecked_qss)
 
     # ---------- Settings ----------
     def _load_settings(self):
@@ -1635,14 +2067,26 @@ QLabel { color:#fff; font-weight: 900; }
         s = QSettings("ORNBH", "SurgiBotClient")
         s.setValue("host", self.ent_host.text()); s.setValue("port", self.ent_port.text())
         s.setValue("token", self.ent_token.text()); s.setValue("geometry", self.saveGeometry())
+        s.sync()
 
     # ---------- Persist monitor state ----------
     def _save_persisted_monitor_state(self, rows: List[dict]):
+        # Monitor rebuilds run every second; coalesce them into at most one write per interval.
+        self._pending_persist_rows = rows
+        if not self._persist_timer.isActive():
+            self._persist_timer.start()
+
+    def _do_persist_now(self):
+        rows = self._pending_persist_rows
+        if rows is None:
+            return
+        self._pending_persist_rows = None
         try:
             s = QSettings(PERSIST_ORG, PERSIST_APP)
-            s.setValue(KEY_LAST_ROWS, json.dumps(rows, ensure_ascii=False))
-            s.setValue(KEY_WAS_IN_MONITOR, json.dumps(sorted(list(self._was_in_monitor))))
-            s.setValue(KEY_CURRENT_MONITOR, json.dumps(sorted(list(self._current_monitor_hn))))
+            s.setValue(KEY_LAST_ROWS, fastjson.dumps([_persistable_row(r) for r in rows]))
+            s.setValue(KEY_WAS_IN_MONITOR, fastjson.dumps(sorted(self._was_in_monitor)))
+            s.setValue(KEY_CURRENT_MONITOR, fastjson.dumps(sorted(self._current_monitor_hn)))
+            s.sync()
         except Exception:
             pass
 
@@ -1657,21 +2101,21 @@ QLabel { color:#fff; font-weight: 900; }
             if isinstance(cur_json, bytes): cur_json = cur_json.decode("utf-8", "ignore")
             if last_rows_json:
                 try:
-                    rows = json.loads(last_rows_json)
+                    rows = fastjson.loads(last_rows_json)
                     if isinstance(rows, list):
                         self.rows_cache = rows[:]
                 except Exception:
                     pass
             if was_json:
                 try:
-                    arr = json.loads(was_json)
+                    arr = fastjson.loads(was_json)
                     if isinstance(arr, list):
                         self._was_in_monitor = set(str(x) for x in arr if isinstance(x, (str,int)))
                 except Exception:
                     pass
             if cur_json:
                 try:
-                    arr = json.loads(cur_json)
+                    arr = fastjson.loads(cur_json)
                     if isinstance(arr, list):
                         self._current_monitor_hn = set(str(x) for x in arr if isinstance(x, (str,int)))
                 except Exception:
@@ -1682,7 +2126,10 @@ QLabel { color:#fff; font-weight: 900; }
             self._update_schedule_completion_markers()
 
     def closeEvent(self, e):
-        self._save_settings(); self._save_persisted_monitor_state(self.rows_cache)
+        self._save_settings()
+        self._persist_timer.stop()
+        self._pending_persist_rows = self.rows_cache
+        self._do_persist_now()
         if self.ws:
             try: self.ws.close()
             except Exception: pass
@@ -1758,6 +2205,7 @@ QLabel { color:#fff; font-weight: 900; }
             changed = True
 
         if changed:
+            entry.refresh_derived()
             entry.version = int(entry.version or 0) + 1
             entry.updated_at = datetime.now().isoformat()
             self.sched.touch_entry(entry)
@@ -1774,51 +2222,35 @@ QLabel { color:#fff; font-weight: 900; }
     def _flash_row_by_uid(self, uid: str):
         if not uid:
             return
-        tree = getattr(self, "tree_sched", None)
+        tree = self.tree_sched
         if tree is None:
             return
-        matches: list[QtWidgets.QTreeWidgetItem] = []
-        for i in range(tree.topLevelItemCount()):
-            parent = tree.topLevelItem(i)
-            if parent is None:
-                continue
-            for j in range(parent.childCount()):
-                child = parent.child(j)
-                entry = child.data(0, QtCore.Qt.UserRole)
-                if isinstance(entry, _SchedEntry) and entry.uid() == uid:
-                    matches.append(child)
-
-        if not matches:
+        item = self._uid_to_item.get(uid)
+        if item is None:
             return
 
-        highlight = QtGui.QBrush(QtGui.QColor("#fef08a"))
-        for item in matches:
-            for col in range(tree.columnCount()):
-                item.setBackground(col, highlight)
+        item.setData(0, FLASH_ROLE, True)
+        tree.viewport().update()
 
         def _clear():
-            for item in matches:
-                self._style_schedule_item(item, False)
+            try:
+                item.setData(0, FLASH_ROLE, None)
+            except RuntimeError:
+                return  # row was removed before the flash expired
+            tree.viewport().update()
 
         QtCore.QTimer.singleShot(1200, _clear)
 
     def _restore_selected_schedule_item(self):
         if not self._last_selected_uid:
             return
-        tree = getattr(self, "tree_sched", None)
+        tree = self.tree_sched
         if tree is None:
             return
-        for i in range(tree.topLevelItemCount()):
-            parent = tree.topLevelItem(i)
-            if parent is None:
-                continue
-            for j in range(parent.childCount()):
-                child = parent.child(j)
-                entry = child.data(0, QtCore.Qt.UserRole)
-                if isinstance(entry, _SchedEntry) and entry.uid() == self._last_selected_uid:
-                    tree.setCurrentItem(child)
-                    tree.scrollToItem(child, QtWidgets.QAbstractItemView.PositionAtCenter)
-                    return
+        item = self._uid_to_item.get(self._last_selected_uid)
+        if item is not None:
+            tree.setCurrentItem(item)
+            tree.scrollToItem(item, QtWidgets.QAbstractItemView.PositionAtCenter)
 
     def _on_postop_clicked(self):
         entry = self._get_active_schedule_entry()
@@ -1828,7 +2260,11 @@ QLabel { color:#fff; font-weight: 900; }
         self._open_postop_dialog(entry)
 
     def _open_postop_dialog(self, entry: _SchedEntry):
-        dlg = PostOpDialog(entry, self)
+        dlg = self._postop_dlg
+        if dlg is None:
+            dlg = self._postop_dlg = PostOpDialog(entry, self)
+        else:
+            dlg.load_entry(entry)
         if dlg.exec() != QtWidgets.QDialog.Accepted:
             return
         values = dlg.values()
@@ -1852,6 +2288,7 @@ QLabel { color:#fff; font-weight: 900; }
         if not changed:
             return
 
+        entry.refresh_derived()
         entry.version = int(entry.version or 0) + 1
         entry.updated_at = datetime.now().isoformat()
         self.sched.touch_entry(entry)
@@ -1862,10 +2299,14 @@ QLabel { color:#fff; font-weight: 900; }
     def _open_postop_by_uid(self, uid: str):
         if not uid:
             return
-        for entry in self.sched.entries:
-            if isinstance(entry, _SchedEntry) and entry.uid() == uid:
-                self._open_postop_dialog(entry)
-                break
+        # the registry is authoritative; a row's UserRole may still hold an entry from before a reload
+        entry = self.sched.find_by_uid(uid)
+        if entry is None:
+            item = self._uid_to_item.get(uid)
+            entry = item.data(0, QtCore.Qt.UserRole) if item is not None else None
+            if not isinstance(entry, _SchedEntry):
+                return
+        self._open_postop_dialog(entry)
 
     def _make_postop_button(self, uid: str) -> QtWidgets.QPushButton:
         btn = QtWidgets.QPushButton("💾 บันทึกหลังผ่าตัด")
@@ -1895,49 +2336,34 @@ QLabel { color:#fff; font-weight: 900; }
         return btn
 
     def _incomplete(self, entry: _SchedEntry) -> bool:
-        if not (entry.time_start and entry.time_end):
-            return True
-        if not (entry.scrub or entry.circulate or entry.assist1 or entry.assist2):
-            return True
-        if not (entry.ops or entry.diags):
-            return True
-        return False
+        return (entry._completeness_mask & _DONE_ALL) != _DONE_ALL
 
     def _first_visible_item(self) -> QtWidgets.QTreeWidgetItem | None:
-        tree = getattr(self, "tree_sched", None)
+        tree = self.tree_sched
         if tree is None:
             return None
-        viewport = tree.viewport()
-        if viewport is None:
-            return None
-        top_y = 0
-        for i in range(tree.topLevelItemCount()):
-            parent = tree.topLevelItem(i)
-            if parent is None:
-                continue
-            rect = tree.visualItemRect(parent)
-            if rect.bottom() >= top_y:
-                if rect.top() <= top_y <= rect.bottom():
-                    return parent
-                for j in range(parent.childCount()):
-                    child = parent.child(j)
-                    if child is None:
-                        continue
-                    child_rect = tree.visualItemRect(child)
-                    if child_rect.bottom() >= top_y:
-                        return child
-                return parent
-        return None
+        # itemAt() goes through the view's row geometry (binary search) instead of a Python walk.
+        item = tree.itemAt(0, 0)
+        if item is None and tree.topLevelItemCount():
+            item = tree.topLevelItem(0)
+        return item
+
+    def _schedule_or_sticky(self, *_):
+        if not self._sticky_timer.isActive():
+            self._sticky_timer.start()
 
     def _update_or_sticky(self):
-        tree = getattr(self, "tree_sched", None)
-        sticky = getattr(self, "_orSticky", None)
+        tree = self.tree_sched
+        sticky = self._orSticky
         if tree is None or sticky is None:
             return
+        if not tree.isVisible():
+            return  # other tab is showing; the viewport Show event refreshes us later
 
         item = self._first_visible_item()
         if item is None:
             sticky.hide()
+            self._last_sticky_key = None
             return
 
         parent = item
@@ -1947,29 +2373,38 @@ QLabel { color:#fff; font-weight: 900; }
         or_text = self._or_item_label(parent)
         if not or_text:
             sticky.hide()
+            self._last_sticky_key = None
             return
 
         rect = tree.visualItemRect(parent)
         if not rect.isValid():
             sticky.hide()
+            self._last_sticky_key = None
             return
 
+        y = max(4, rect.top() + 6)
+        key = (or_text, y)
+        if key == self._last_sticky_key and sticky.isVisible():
+            return  # same OR group at the same offset; nothing to relayout
+        self._last_sticky_key = key
+
         self._orStickyLabel.setText(or_text)
         sticky.adjustSize()
         width = max(120, sticky.sizeHint().width())
         height = 32
         x = 8
-        y = max(4, rect.top() + 6)
         sticky.setGeometry(x, y, width, height)
         sticky.show()
         sticky.raise_()
 
     def _set_chip(self, ok: bool):
-        base = getattr(self, "_status_pill_base", "background:#ffffff;border:1px solid #e5e7eb;border-radius:10px;padding:4px 10px;font-weight:600;")
-        color = "#16a34a" if ok else "#ef4444"
-        text = "  • Online  " if ok else "  • Offline  "
-        self.status_chip.setText(text)
-        self.status_chip.setStyleSheet(f"{base}color:{color};")
+        # Re-parsing QSS is costly; only touch the chip when the state flips.
+        qss = self._pill_online_qss if ok else self._pill_offline_qss
+        if self._chip_qss is qss:
+            return
+        self._chip_qss = qss
+        self.status_chip.setText("  • Online  " if ok else "  • Offline  ")
+        self.status_chip.setStyleSheet(qss)
 
     def _client(self):
         try:
@@ -1981,11 +2416,27 @@ QLabel { color:#fff; font-weight: 900; }
             return self.cli
 
     def _on_health(self):
-        def _check():
-            return self._client().health()
-
-        task = NetworkTask(_check, self, "_on_health_success", "_on_health_error")
-        self._thread_pool.start(task)
+        # Async GET on the GUI event loop; repeated clicks while one is pending are ignored.
+        if self._health_inflight:
+            return
+        self._health_inflight = True
+        cli = self._client()
+        req = QtNetwork.QNetworkRequest(QUrl(cli.base + API_HEALTH))
+        req.setRawHeader(b"Accept", b"application/json")
+        req.setTransferTimeout(int(cli.timeout * 1000))
+        reply = self._nam.get(req)
+        reply.finished.connect(lambda: self._on_health_reply(reply))
+
+    def _on_health_reply(self, reply: QtNetwork.QNetworkReply):
+        self._health_inflight = False
+        try:
+            code = reply.attribute(QtNetwork.QNetworkRequest.HttpStatusCodeAttribute)
+            if reply.error() == QtNetwork.QNetworkReply.NoError and code is not None and int(code) < 400:
+                self._on_health_success(bytes(reply.readAll()))
+            else:
+                self._on_health_error(reply.errorString())
+        finally:
+            reply.deleteLater()
 
     @QtCore.Slot(object)
     def _on_health_success(self, _payload: object):
@@ -2012,105 +2463,15 @@ QLabel { color:#fff; font-weight: 900; }
             else:
                 src = next((v for v in payload.values() if isinstance(v, list)), [])
 
-        rows = []
-        for i, it in enumerate(src, start=1):
-            if not isinstance(it, dict):
-                continue
+        return [_build_monitor_row(i, it) for i, it in enumerate(src, start=1) if isinstance(it, dict)]
 
-            hn_full = str(it.get("hn_full") or it.get("hn") or "").strip()
-
-            pid = str(
-                it.get("patient_id")
-                or it.get("pid")
-                or it.get("queue_id")
-                or ""
-            ).strip()
-            if not pid:
-                or_room = str(it.get("or") or it.get("or_room") or "").strip()
-                q = str(it.get("queue") or it.get("q") or "").strip()
-                if or_room and q:
-                    pid = f"{or_room}-{q}"
-                else:
-                    pid = f"row-{i}"
-
-            status_raw = str(
-                it.get("status")
-                or it.get("state")
-                or it.get("operation_status")
-                or it.get("op_status")
-                or ""
-            ).strip().lower()
-            status_map = {
-                "รอผ่าตัด": "รอผ่าตัด", "waiting": "รอผ่าตัด",
-                "queued": "รอผ่าตัด", "pending": "รอผ่าตัด",
-                "กำลังผ่าตัด": "กำลังผ่าตัด", "operating": "กำลังผ่าตัด",
-                "in operation": "กำลังผ่าตัด", "in_operation": "กำลังผ่าตัด",
-                "in-surgery": "กำลังผ่าตัด", "surgery": "กำลังผ่าตัด",
-                "ongoing": "กำลังผ่าตัด",
-                "กำลังพักฟื้น": "กำลังพักฟื้น", "recovery": "กำลังพักฟื้น",
-                "pacu": "กำลังพักฟื้น", "post-op": "กำลังพักฟื้น",
-                "post_operation": "กำลังพักฟื้น",
-                "กำลังส่งกลับตึก": "กำลังส่งกลับตึก", "sending back": "กำลังส่งกลับตึก",
-                "transfer": "กำลังส่งกลับตึก", "returning": "กำลังส่งกลับตึก",
-                "เลื่อนการผ่าตัด": "เลื่อนการผ่าตัด", "postponed": "เลื่อนการผ่าตัด",
-                "deferred": "เลื่อนการผ่าตัด", "canceled": "เลื่อนการผ่าตัด",
-                "cancelled": "เลื่อนการผ่าตัด",
-            }
-            if status_raw in status_map:
-                status = status_map[status_raw]
-            else:
-                try:
-                    idx = int(status_raw)
-                    map_idx = ["รอผ่าตัด", "กำลังผ่าตัด", "กำลังพักฟื้น", "กำลังส่งกลับตึก", "เลื่อนการผ่าตัด"]
-                    status = map_idx[idx] if 0 <= idx < len(map_idx) else "รอผ่าตัด"
-                except Exception:
-                    status = "รอผ่าตัด"
-
-            ts_val = (
-                it.get("timestamp")
-                or it.get("ts")
-                or it.get("updated_at")
-                or it.get("created_at")
-                or it.get("time")
-                or ""
-            )
-            ts_iso = ""
-            try:
-                if isinstance(ts_val, (int, float)):
-                    ts_iso = datetime.fromtimestamp(float(ts_val)).isoformat(timespec="seconds")
-                elif isinstance(ts_val, str) and ts_val.strip():
-                    ts_iso = ts_val
-            except Exception:
-                ts_iso = ""
-            if not _parse_iso(ts_iso):
-                ts_iso = datetime.now().isoformat(timespec="seconds")
-
-            eta_raw = it.get("eta_minutes", it.get("eta", it.get("eta_min", None)))
-            try:
-                eta_minutes = int(eta_raw) if str(eta_raw).strip() != "" else None
-            except Exception:
-                eta_minutes = None
-
-            rid = it.get("id") or (hn_full if hn_full else pid) or i
-
-            rows.append({
-                "id": str(rid),
-                "hn_full": hn_full if hn_full else None,
-                "patient_id": str(pid),
-                "status": status,
-                "timestamp": ts_iso,
-                "eta_minutes": eta_minutes,
-            })
-        return rows
-
-    def _render_time_cell(self, row: dict) -> str:
+    def _render_time_cell(self, row: dict, now: datetime | None = None) -> str:
         status = row.get("status", "")
-        ts_iso = row.get("timestamp")
         eta_min = row.get("eta_minutes")
-        ts = _parse_iso(ts_iso)
+        ts = _row_ts(row)
 
-        if status == "กำลังผ่าตัด" and ts:
-            now = datetime.now()
+        if status == _S_OP and ts:
+            now = now or datetime.now()
             elapsed = now - ts
             base = _fmt_td(elapsed)
             if eta_min is not None:
@@ -2123,8 +2484,8 @@ QLabel { color:#fff; font-weight: 900; }
                     return base
             return base
 
-        if ts and status in ("กำลังพักฟื้น", "พักฟื้นครบแล้ว", "กำลังส่งกลับตึก", "เลื่อนการผ่าตัด"):
-            return _fmt_td(datetime.now() - ts)
+        if ts and status in _TIME_RELEVANT_STATUSES:
+            return _fmt_td((now or datetime.now()) - ts)
 
         return ""
 
@@ -2137,72 +2498,80 @@ QLabel { color:#fff; font-weight: 900; }
     def _rebuild(self, rows):
         # 1) แจ้งเตือนใน tray เมื่อสถานะเปลี่ยน
         new_map = {}
+        changes = []
         for r in rows or []:
             pid, st = r.get("patient_id", ""), r.get("status", "")
             if pid:
                 new_map[pid] = st
                 prev = self._last_states.get(pid)
-                if prev is not None and prev != st and self.tray:
-                    self.tray.showMessage("SurgiBot", f"{pid} → {st}", QSystemTrayIcon.Information, 3000)
+                if prev is not None and prev != st:
+                    changes.append(f"{pid} → {st}")
         self._last_states = new_map
+        if changes and self.tray:
+            # one balloon per refresh, however many statuses flipped together
+            if len(changes) == 1:
+                msg = changes[0]
+            else:
+                msg = f"{len(changes)} สถานะถูกปรับ:\n" + "\n".join(changes[:5]) + ("\n…" if len(changes) > 5 else "")
+            self.tray.showMessage("SurgiBot", msg, QSystemTrayIcon.Information, 3000)
 
         # 2) บันทึก cache และเปิดโหมด monitor
         self.rows_cache = rows if isinstance(rows, list) else []
         self.monitor_ready = True
 
         # เก็บว่า HN ใดเคยอยู่ใน monitor แล้ว (ใช้กับการขีด + watermark)
-        for r in self.rows_cache:
-            hn_all = self._extract_hn_from_row(r)
-            if hn_all:
-                self._was_in_monitor.add(hn_all)
+        self._was_in_monitor.update(hn for hn in map(_row_hn, self.rows_cache) if hn)
+
+        self._refresh_monitor_view()
+
+        # 5) persist state
+        self._save_persisted_monitor_state(self.rows_cache)
 
+    def _refresh_monitor_view(self):
+        """Time-dependent part of _rebuild: auto-purge, monitor rows, elapsed times, schedule filter."""
+        now = datetime.now()
         # ตัดรายการออกตามกติกา auto-purge (ฝั่ง client)
-        visible_rows = [r for r in self.rows_cache if not self._should_auto_purge(r)]
+        visible_rows = [r for r in self.rows_cache if not self._should_auto_purge(r, now)]
 
         # อัปเดตรายชื่อ HN ที่ "ยังอยู่" ใน monitor ตอนนี้
-        current = set()
-        for r in visible_rows:
-            hn = self._extract_hn_from_row(r)
-            if hn:
-                current.add(hn)
+        current = {hn for hn in map(_row_hn, visible_rows) if hn}
         self._current_monitor_hn = current
 
         # 3) วาดตาราง Monitor
-        self.table.setRowCount(0)
-        for r in visible_rows:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-
-            # ID
-            self.table.setItem(row, 0, QtWidgets.QTableWidgetItem(str(r.get("id", ""))))
-
-            # Patient ID
-            self.table.setItem(row, 1, QtWidgets.QTableWidgetItem(str(r.get("patient_id", ""))))
-
-            # สถานะ + สีพื้นตามสถานะ
-            status_item = QtWidgets.QTableWidgetItem(str(r.get("status", "")))
-            col = STATUS_COLORS.get(r.get("status", ""))
-            if col:
-                status_item.setBackground(QtGui.QBrush(QtGui.QColor(col)))
-                fg = "#ffffff" if r.get("status") in ("กำลังผ่าตัด", "กำลังส่งกลับตึก",
-                                                      "เลื่อนการผ่าตัด") else "#000000"
-                status_item.setForeground(QtGui.QBrush(QtGui.QColor(fg)))
-            self.table.setItem(row, 2, status_item)
-
-            # เวลาแสดงผล
-            self.table.setItem(row, 3, QtWidgets.QTableWidgetItem(self._render_time_cell(r)))
-
-        # 4) วาดตาราง Schedule
-        self._render_schedule_tree()
+        self.table.setUpdatesEnabled(False)
+        try:
+            self.monitor_model.set_rows(visible_rows)
+            self.monitor_model.refresh_time_column(now)
+        finally:
+            self.table.setUpdatesEnabled(True)
+
+        # 4) วาดตาราง Schedule (เฉพาะเมื่อข้อมูลที่ใช้กรองเปลี่ยน)
+        sched_key = (frozenset(current), _now_period(now), now.date())
+        if sched_key != self._sched_render_key:
+            self._sched_render_key = sched_key
+            self._render_schedule_tree()
         self._update_schedule_completion_markers()
 
-        # 5) persist state
-        self._save_persisted_monitor_state(self.rows_cache)
+    def _queue_rebuild(self, rows):
+        self._pending_rows = rows
+        if not self._rebuild_timer.isActive():
+            self._rebuild_timer.start()
+
+    def _do_rebuild(self):
+        rows, self._pending_rows = self._pending_rows, None
+        if rows is not None:
+            self._rebuild(rows)
+
+    def _rebuild_now(self, rows):
+        # drop any queued batch first, or it would overwrite this view when the timer fires
+        self._rebuild_timer.stop()
+        self._pending_rows = None
+        self._rebuild(rows)
 
     def _refresh(self, prefer_server=True):
         if not prefer_server:
             self._set_chip(False)
-            self._rebuild(self.model.rows)
+            self._rebuild_now(self.model.rows)
             return
 
         self._refresh_requested = True
@@ -2221,12 +2590,8 @@ QLabel { color:#fff; font-weight: 900; }
     @QtCore.Slot(object)
     def _on_refresh_success(self, payload: object):
         self._refresh_inflight = False
-        rows = self._extract_rows(payload)
-        if rows is not None:
-            self._rebuild(rows)
-            self._set_chip(True)
-        else:
-            self._rebuild(self.model.rows)
+        self._queue_rebuild(self._extract_rows(payload))
+        self._set_chip(True)
         if self._refresh_requested:
             self._refresh_timer.start(CONFIG.client_debounce_ms)
 
@@ -2234,7 +2599,7 @@ QLabel { color:#fff; font-weight: 900; }
     def _on_refresh_error(self, err: object):
         self._refresh_inflight = False
         self._set_chip(False)
-        self._rebuild(self.model.rows)
+        self._rebuild_now(self.model.rows)
         logger.warning("Refresh failed: %s", err)
         if self._refresh_requested:
             self._refresh_timer.start(CONFIG.client_debounce_ms)
@@ -2281,14 +2646,15 @@ QLabel { color:#fff; font-weight: 900; }
     def _on_ws_message(self, msg: str):
         try:
             payload = json.loads(msg)
-            rows = self._extract_rows(payload)
-            if rows is not None:
-                self._rebuild(rows)
+            self._queue_rebuild(self._extract_rows(payload))
         except Exception:
             pass
 
     def _on_reconnect_clicked(self):
+        prev_base = self.cli.base
         self.cli = self._client()
+        if self.cli.base != prev_base:
+            SESSION_MANAGER.warmup(self.cli.base + API_HEALTH, timeout=self.cli.timeout)
         self._save_settings()
         self._on_health()
         self._refresh(True)
@@ -2298,8 +2664,8 @@ QLabel { color:#fff; font-weight: 900; }
     def _finalize_scan_if_any(self):
         if not self._scan_buf:
             return
-        digits = "".join(ch for ch in self._scan_buf if ch.isdigit())
-        self._scan_buf = ""
+        digits = "".join(ch for ch in "".join(self._scan_buf) if ch.isdigit())
+        self._scan_buf = []
         if not digits:
             return
         if len(digits) >= 9:
@@ -2314,16 +2680,13 @@ QLabel { color:#fff; font-weight: 900; }
             self.lbl_scan_state.setStyleSheet("color:#16a34a;font-weight:600;")
 
     def eventFilter(self, obj, event):
-        tree = getattr(self, "tree_sched", None)
-        viewport = tree.viewport() if tree else None
+        tree = self.tree_sched
+        viewport = tree.viewport() if tree is not None else None
         if viewport is not None and obj is viewport:
-            if event.type() in (
-                QtCore.QEvent.Resize,
-                QtCore.QEvent.Paint,
-                QtCore.QEvent.Show,
-                QtCore.QEvent.UpdateRequest,
-            ):
-                QtCore.QTimer.singleShot(0, self._update_or_sticky)
+            # scrolling and expand/collapse reach _update_or_sticky through their own signals;
+            # Paint/UpdateRequest fire every frame and only re-queued the same work
+            if event.type() in (QtCore.QEvent.Resize, QtCore.QEvent.Show):
+                self._schedule_or_sticky()
 
         if event.type() == QtCore.QEvent.KeyPress and self.scan_enabled:
             key = event.key()
@@ -2334,8 +2697,8 @@ QLabel { color:#fff; font-weight: 900; }
                 return True
             if text and text.isprintable():
                 if not self._scan_timer.isActive():
-                    self._scan_buf = ""
-                self._scan_buf += text
+                    self._scan_buf = []
+                self._scan_buf.append(text)
                 self._scan_timer.start(self._scan_timeout_ms)
                 return False
         return super().eventFilter(obj, event)
@@ -2343,16 +2706,13 @@ QLabel { color:#fff; font-weight: 900; }
     # ---------- Table selection ----------
     def _on_table_select(self):
         try:
-            row = self.table.currentRow()
-            if row < 0:
+            sel = self.table.selectionModel().selectedRows()
+            r = self.monitor_model.row_at(sel[0].row()) if sel else None
+            if r is None:
                 return
-            pid_item = self.table.item(row, 1)
-            st_item = self.table.item(row, 2)
-            id_item = self.table.item(row, 0)
-
-            pid = (pid_item.text().strip() if pid_item else "")
-            st = (st_item.text().strip() if st_item else "")
-            hid = (id_item.text().strip() if id_item else "")
+            pid = str(r.get("patient_id", "")).strip()
+            st = str(r.get("status", "")).strip()
+            hid = str(r.get("id", "")).strip()
 
             if pid:
                 self.ent_pid.setText(pid)
@@ -2461,9 +2821,55 @@ QLabel { color:#fff; font-weight: 900; }
     # ---------- Schedule ----------
 
 
+    @staticmethod
+    def _schedule_row_texts(e: _SchedEntry) -> tuple:
+        return (
+            "",
+            _period_label(e.period),
+            (e.time or "-"),
+            e.hn,
+            (e.name or "-"),
+            (str(e.age) if e.age not in (None, "") else "-"),
+            e._diags_str,
+            e._ops_str,
+            (e.doctor or "-"),
+            (e.ward or "-"),
+            (e.case_size or "-"),
+            (e.dept or "-"),
+            (e.assist1 or "-"),
+            (e.assist2 or "-"),
+            (e.scrub or "-"),
+            (e.circulate or "-"),
+            (e.time_start or "-"),
+            (e.time_end or "-"),
+            e._queue_label,
+            (e.urgency or "Elective"),
+        )
+
+    def _new_or_header(self, orr: str) -> QtWidgets.QTreeWidgetItem:
+        tree = self.tree_sched
+        parent = QtWidgets.QTreeWidgetItem([""] * tree.columnCount())
+        header_title = f"{orr}  ห้องผ่าตัด"
+        parent.setText(0, header_title)
+        parent.setData(0, QtCore.Qt.UserRole + 200, orr)
+        parent.setData(0, QtCore.Qt.UserRole + 201, header_title)
+        return parent
+
+    def _drop_or_header(self, parent: QtWidgets.QTreeWidgetItem):
+        for j in range(parent.childCount()):
+            child = parent.child(j)
+            key = child.data(0, QtCore.Qt.UserRole + 202)
+            if self._sched_items.get(key) is child:
+                self._sched_items.pop(key, None)
+                self._row_state.pop(key, None)
+
     def _render_schedule_tree(self):
-        """วาด Result Schedule ให้ตรงกับ Registry + เคารพสถานะพับ/ขยายของผู้ใช้"""
-        tree = getattr(self, "tree_sched", None)
+        """วาด Result Schedule ให้ตรงกับ Registry + เคารพสถานะพับ/ขยายของผู้ใช้
+
+        Items are kept across renders (keyed by OR room and entry uid); only rows whose
+        rendered texts changed are rewritten and only set-differences are added/removed.
+        """
+        tree = self.tree_sched
         if tree is None:
             return
 
@@ -2477,7 +2883,6 @@ QLabel { color:#fff; font-weight: 900; }
         tree.setUpdatesEnabled(False)
         try:
             self._clear_sched_pulser()
-            tree.clear()
 
             now_code = _now_period(datetime.now())  # "in" | "off"
             in_monitor = set(self._current_monitor_hn or [])
@@ -2508,60 +2913,104 @@ QLabel { color:#fff; font-weight: 900; }
             def room_key(x: str):
                 return (order.index(x) if x in order else 999, x)
 
-            def row_sort_key(e: _SchedEntry):
-                q = int(e.queue or 0)
-                if q > 0:
-                    return (0, q, "")
-                return (1, 0, e.time or "99:99")
-
-            for orr in sorted(groups.keys(), key=room_key):
-                if not groups[orr]:
-                    continue
-
-                parent = QtWidgets.QTreeWidgetItem([""] * tree.columnCount())
-                header_title = f"{orr}  ห้องผ่าตัด"
-                parent.setText(0, header_title)
-                parent.setData(0, QtCore.Qt.UserRole + 200, orr)
-                parent.setData(0, QtCore.Qt.UserRole + 201, header_title)
+            rooms = sorted((orr for orr, lst in groups.items() if lst), key=room_key)
+
+            # per-room wanted rows; duplicate uids get a suffixed key so each keeps its own item
+            wanted: dict[str, list[tuple[str, _SchedEntry]]] = {}
+            seen: dict[str, int] = {}
+            for orr in rooms:
+                lst = []
+                for e in sorted(groups[orr], key=_SCHED_SORT_KEY):
+                    uid = e.uid()
+                    n = seen.get(uid, 0)
+                    seen[uid] = n + 1
+                    lst.append((uid if n == 0 else f"{uid}#{n}", e))
+                wanted[orr] = lst
+
+            # drop OR headers that have no rows anymore
+            for orr in [o for o in self._or_items if o not in wanted]:
+                parent = self._or_items.pop(orr)
+                self._drop_or_header(parent)
+                idx = tree.indexOfTopLevelItem(parent)
+                if idx >= 0:
+                    tree.takeTopLevelItem(idx)
+
+            role_key = QtCore.Qt.UserRole + 202
+            uid_to_item: dict[str, QtWidgets.QTreeWidgetItem] = {}
+
+            for i, orr in enumerate(rooms):
+                parent = self._or_items.get(orr)
+                created = parent is None
+                if created:
+                    parent = self._new_or_header(orr)
+                    self._or_items[orr] = parent
+                    tree.insertTopLevelItem(i, parent)
+                else:
+                    idx = tree.indexOfTopLevelItem(parent)
+                    if idx != i:
+                        tree.takeTopLevelItem(idx)
+                        tree.insertTopLevelItem(i, parent)
+                        # a re-inserted top-level item comes back collapsed
+                        self._apply_or_expand_state(parent)
                 parent.setFirstColumnSpanned(True)
-                tree.addTopLevelItem(parent)
-
-                self._style_or_group_header(parent, "#eef2ff")
-                parent.setFlags((parent.flags() | QtCore.Qt.ItemIsEnabled) & ~QtCore.Qt.ItemIsSelectable)
-
-                accent = OR_HEADER_COLORS.get(orr, "#64748b")
-                tree.setItemWidget(parent, 0, self._or_card_widget(orr, accent))
-
-                self._apply_or_expand_state(parent)
-
-                for e in sorted(groups[orr], key=row_sort_key):
-                    row = QtWidgets.QTreeWidgetItem([
-                        "",
-                        _period_label(e.period),
-                        (e.time or "-"),
-                        e.hn,
-                        (e.name or "-"),
-                        (str(e.age) if e.age not in (None, "") else "-"),
-                        (", ".join(e.diags) if getattr(e, "diags", None) else "-"),
-                        (", ".join(e.ops) if getattr(e, "ops", None) else "-"),
-                        (e.doctor or "-"),
-                        (e.ward or "-"),
-                        (e.case_size or "-"),
-                        (e.dept or "-"),
-                        (e.assist1 or "-"),
-                        (e.assist2 or "-"),
-                        (e.scrub or "-"),
-                        (e.circulate or "-"),
-                        (e.time_start or "-"),
-                        (e.time_end or "-"),
-                        (str(e.queue) if str(getattr(e, "queue", "0")).isdigit() and int(getattr(e, "queue", "0")) > 0 else "ตามเวลา"),
-                        (e.urgency or "Elective"),
-                    ])
-                    row.setData(0, QtCore.Qt.UserRole, e)
-                    parent.addChild(row)
 
+                if created:
+                    self._style_or_group_header(parent, "#eef2ff")
+                    parent.setFlags((parent.flags() | QtCore.Qt.ItemIsEnabled) & ~QtCore.Qt.ItemIsSelectable)
+                    self._apply_or_expand_state(parent)
+                if tree.itemWidget(parent, 0) is None:
+                    # fresh header, or Qt dropped the index widget when the item was moved
+                    accent = OR_HEADER_COLORS.get(orr, "#64748b")
+                    tree.setItemWidget(parent, 0, self._or_card_widget(orr, accent))
+
+                rows = wanted[orr]
+                keys = {k for k, _ in rows}
+                for j in range(parent.childCount() - 1, -1, -1):
+                    child = parent.child(j)
+                    key = child.data(0, role_key)
+                    if key not in keys:
+                        parent.takeChild(j)
+                        if self._sched_items.get(key) is child:
+                            self._sched_items.pop(key, None)
+                            self._row_state.pop(key, None)
+
+                for j, (key, e) in enumerate(rows):
+                    row = self._sched_items.get(key)
+                    if row is None or row.parent() is not parent:
+                        if row is not None and row.parent() is not None:
+                            row.parent().removeChild(row)
+                        row = QtWidgets.QTreeWidgetItem()
+                        row.setData(0, role_key, key)
+                        parent.insertChild(j, row)
+                        self._sched_items[key] = row
+                        self._row_state.pop(key, None)
+                    elif parent.indexOfChild(row) != j:
+                        parent.takeChild(parent.indexOfChild(row))
+                        parent.insertChild(j, row)
+
+                    # entries are only mutated through paths that bump .version, so the same
+                    # object at the same version renders the same texts
+                    prev = self._row_state.get(key)
+                    if prev is None or prev[0] is not e or prev[1] != e.version:
+                        texts = self._schedule_row_texts(e)
+                        old = prev[2] if prev is not None else None
+                        if old != texts:
+                            for c, t in enumerate(texts):
+                                if old is None or old[c] != t:
+                                    row.setText(c, t)
+                        self._row_state[key] = (e, e.version, texts)
+                    if row.data(0, QtCore.Qt.UserRole) is not e:
+                        row.setData(0, QtCore.Qt.UserRole, e)
+                    uid_to_item.setdefault(e.uid(), row)
+
+                    has_btn = tree.itemWidget(row, 0) is not None
                     if self._incomplete(e):
-                        tree.setItemWidget(row, 0, self._make_postop_button(e.uid()))
+                        if not has_btn:
+                            tree.setItemWidget(row, 0, self._make_postop_button(e.uid()))
+                    elif has_btn:
+                        tree.removeItemWidget(row, 0)
+
+            self._uid_to_item = uid_to_item
         finally:
             tree.setUpdatesEnabled(True)
 
@@ -2573,11 +3022,28 @@ QLabel { color:#fff; font-weight: 900; }
 
             QtCore.QTimer.singleShot(0, _restore_scroll)
 
+        if not self._sched_columns_frozen and tree.topLevelItemCount():
+            QtCore.QTimer.singleShot(0, self._freeze_schedule_columns)
         QtCore.QTimer.singleShot(0, self._autofit_schedule_columns)
-        QtCore.QTimer.singleShot(0, self._update_or_sticky)
+        self._schedule_or_sticky()
         QtCore.QTimer.singleShot(0, self._restore_selected_schedule_item)
         if self.monitor_ready:
             self._update_schedule_completion_markers()
+    def _freeze_schedule_columns(self):
+        """After the first populated render, pin the measured widths and stop ResizeToContents.
+
+        ResizeToContents re-measures every row of every column on each model change; from
+        here on only the few columns in _autofit_schedule_columns are re-fitted explicitly.
+        """
+        if self._sched_columns_frozen:
+            return
+        hdr = self.tree_sched.header()
+        for i in range(self.tree_sched.columnCount()):
+            size = hdr.sectionSize(i)
+            hdr.setSectionResizeMode(i, QtWidgets.QHeaderView.Interactive)
+            hdr.resizeSection(i, size)
+        self._sched_columns_frozen = True
+
     def _update_schedule_completion_markers(self):
         return
 
@@ -2592,10 +3058,12 @@ QLabel { color:#fff; font-weight: 900; }
         item.setFlags(QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable)
 
     def _check_schedule_seq(self):
-        if self.sched.refresh_if_changed():
-            self._render_schedule_tree()
-        # ไม่บังคับ expandAll เพื่อคงสถานะพับ/ขยายของผู้ใช้
-        QtCore.QTimer.singleShot(0, self._autofit_schedule_columns)
+        if not self.sched.refresh_if_changed():
+            return
+        # always re-render on a seq bump: the reload replaced every _SchedEntry, and rows must not
+        # keep the discarded objects; unchanged rows are skipped cheaply inside the render
+        # ไม่บังคับ expandAll เพื่อคงสถานะพับ/ขยายของผู้ใช้ (autofit ถูกเรียกจาก render)
+        self._render_schedule_tree()
 
 
 # ---------- main (module level) ----------
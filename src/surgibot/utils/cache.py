@@ -20,18 +20,32 @@ def cached_lookup(maxsize: int = 256) -> Callable[[Callable[..., List[str]]], Ca
     return decorator
 
 
+@lru_cache(maxsize=8)
+def _lower_pairs(items: tuple[str, ...]) -> tuple[tuple[str, str], ...]:
+    return tuple((item, item.lower()) for item in items)
+
+
+def _pairs(items: Iterable[str]) -> Iterable[tuple[str, str]]:
+    """(item, item.lower()) pairs; tuples are hashable, so their lowered view is computed once and reused."""
+    if isinstance(items, tuple):
+        return _lower_pairs(items)
+    return ((item, item.lower()) for item in items)
+
+
 def prefix_match(query: str, items: Iterable[str]) -> List[str]:
+    """Items starting with ``query`` (case-insensitive). Pass a tuple to reuse its lowered copy across calls."""
     q = query.lower().strip()
     if not q:
         return list(items)
-    return [item for item in items if item.lower().startswith(q)]
+    return [item for item, low in _pairs(items) if low.startswith(q)]
 
 
 def contains_match(query: str, items: Iterable[str]) -> List[str]:
+    """Items containing ``query`` (case-insensitive). Pass a tuple to reuse its lowered copy across calls."""
     q = query.lower().strip()
     if not q:
         return list(items)
-    return [item for item in items if q in item.lower()]
+    return [item for item, low in _pairs(items) if q in low]
 
 
 __all__ = ["cached_lookup", "prefix_match", "contains_match"]
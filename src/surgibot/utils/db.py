@@ -2,13 +2,15 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Iterator
 
 from ..config import CONFIG
 
-_CONNECTIONS: dict[Path, sqlite3.Connection] = {}
+# One connection per (thread, database): threads no longer queue behind a shared connection's mutex.
+_LOCAL = threading.local()
 
 
 def _configure(conn: sqlite3.Connection) -> None:
@@ -16,16 +18,22 @@ def _configure(conn: sqlite3.Connection) -> None:
     conn.execute("PRAGMA synchronous=NORMAL;")
     conn.execute("PRAGMA cache_size=-20000;")
     conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA mmap_size=268435456;")
+    conn.execute("PRAGMA wal_autocheckpoint=1000;")
 
 
 def get_connection(db_name: str) -> sqlite3.Connection:
+    conns: dict[Path, sqlite3.Connection] | None = getattr(_LOCAL, "conns", None)
+    if conns is None:
+        conns = _LOCAL.conns = {}
     path = CONFIG.data_dir / db_name
-    if path not in _CONNECTIONS:
+    conn = conns.get(path)
+    if conn is None:
         path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(path, check_same_thread=False)
+        conn = sqlite3.connect(path)
         _configure(conn)
-        _CONNECTIONS[path] = conn
-    return _CONNECTIONS[path]
+        conns[path] = conn
+    return conn
 
 
 @contextmanager
@@ -39,4 +47,31 @@ def db_cursor(db_name: str) -> Iterator[sqlite3.Cursor]:
         cur.close()
 
 
-__all__ = ["get_connection", "db_cursor"]
+@contextmanager
+def db_transaction(db_name: str) -> Iterator[sqlite3.Connection]:
+    """Group many statements (e.g. ``executemany``) into one commit; roll back on error.
+
+    When this thread's connection already has a transaction open (inside ``db_cursor`` or another
+    ``db_transaction``), the block runs as a SAVEPOINT and the outer block owns the commit.
+    """
+    conn = get_connection(db_name)
+    if conn.in_transaction:
+        conn.execute("SAVEPOINT db_transaction")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK TO db_transaction")
+            conn.execute("RELEASE db_transaction")
+            raise
+        conn.execute("RELEASE db_transaction")
+        return
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+__all__ = ["get_connection", "db_cursor", "db_transaction"]
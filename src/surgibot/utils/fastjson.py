@@ -0,0 +1,39 @@
+"""JSON helpers that use orjson when it is installed."""
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+
+def dumps(obj: Any) -> str:
+    """Serialize to a UTF-8 ``str`` (non-ASCII kept as-is, like ``ensure_ascii=False``)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            pass  # e.g. non-str dict keys; stdlib json is more lenient
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def dumpb(obj: Any) -> bytes:
+    """Serialize to UTF-8 ``bytes``, ready to use as an HTTP response body."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+__all__ = ["dumps", "dumpb", "loads"]
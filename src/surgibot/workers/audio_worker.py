@@ -2,11 +2,13 @@
 from __future__ import annotations
 
 import hashlib
+import os
 import queue
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 import pygame
 from gtts import gTTS
@@ -16,6 +18,9 @@ from ..logging_setup import get_logger
 
 logger = get_logger(__name__)
 
+_MAX_CLIP_SECONDS = 120.0
+_TTS_TIMEOUT_SECONDS = 30.0
+
 
 class AudioWorker:
     """Background worker that serializes audio playback and caching."""
@@ -23,10 +28,21 @@ class AudioWorker:
     def __init__(self, cache_dir: Optional[Path] = None) -> None:
         self.cache_dir = cache_dir or CONFIG.audio_cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self._queue: "queue.Queue[Tuple[str, str, int]]" = queue.Queue()
+        self._queue: "queue.Queue[Tuple[str, str, int, int, float]]" = queue.Queue()
         self._lock = threading.Lock()
         self._stop = threading.Event()
-        self._last_text: Optional[Tuple[str, float]] = None
+        # hash((th, en)) -> monotonic time it was last queued; pruned lazily once entries pass the TTL
+        self._recent: Dict[int, float] = {}
+        self._enqueues = 0
+        # gTTS is a network round-trip: synthesize TH and EN concurrently, ahead of playback.
+        self._tts_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="surgibot-tts")
+        # cache path -> in-flight synthesis, so a prefetch and the playback share one request
+        self._synth_pending: Dict[Path, Future] = {}
+        # Clips still cached under the previous SHA-256 naming; adopted (renamed) on first use.
+        # Once empty, a cache miss costs no extra hash or rename.
+        self._legacy_names = {
+            p.name for p in self.cache_dir.glob("*.mp3") if len(p.stem) == 64
+        }
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
         try:
@@ -35,20 +51,60 @@ class AudioWorker:
             logger.warning("pygame mixer init failed: %s", exc)
 
     def enqueue_bilingual(self, th_text: str, en_text: str, pause_ms: int) -> None:
+        self.enqueue_bilingual_repeat(th_text, en_text, pause_ms, repeat=1, gap_sec=0.0)
+
+    def enqueue_bilingual_repeat(
+        self, th_text: str, en_text: str, pause_ms: int, repeat: int, gap_sec: float
+    ) -> None:
+        """Queue ``repeat`` TH -> EN plays; each gap starts once the previous play has finished."""
         if not th_text and not en_text:
             return
+        key = hash((th_text, en_text))
+        ttl = CONFIG.announcement_ttl_seconds
         now = time.monotonic()
         with self._lock:
-            if self._last_text and self._last_text[0] == th_text + en_text:
-                if now - self._last_text[1] < CONFIG.announcement_ttl_seconds:
-                    logger.debug("Skipping duplicate announcement within TTL")
-                    return
-            self._last_text = (th_text + en_text, now)
-        self._queue.put((th_text, en_text, pause_ms))
+            self._enqueues += 1
+            if self._enqueues % 32 == 0:
+                self._recent = {k: t for k, t in self._recent.items() if now - t < ttl}
+            last = self._recent.get(key)
+            if last is not None and now - last < ttl:
+                logger.debug("Skipping duplicate announcement within TTL")
+                return
+            self._recent[key] = now
+        self.prefetch_bilingual(th_text, en_text)
+        self._queue.put((th_text, en_text, pause_ms, max(1, repeat), max(0.0, gap_sec)))
+
+    def prefetch_bilingual(self, th_text: str, en_text: str) -> None:
+        """Start synthesizing any uncached TH/EN clip in the background (no-op when cached)."""
+        self.prefetch(th_text, "th")
+        self.prefetch(en_text, "en")
+
+    def prefetch(self, text: str, lang: str) -> Optional[Future]:
+        """Return the pending synthesis for ``text``, starting one if the clip is not cached."""
+        if not text:
+            return None
+        return self._prefetch_path(text, lang, self._cache_path(text, lang))
+
+    def _prefetch_path(self, text: str, lang: str, path: Path) -> Optional[Future]:
+        if path.exists():
+            return None
+        with self._lock:
+            future = self._synth_pending.get(path)
+            if future is not None:
+                return future
+            try:
+                future = self._tts_pool.submit(self._synthesize, text, lang, path)
+            except RuntimeError:  # pool already shut down
+                return None
+            self._synth_pending[path] = future
+        # Outside the lock: the callback runs inline if the future has already finished.
+        future.add_done_callback(lambda _f, p=path: self._synth_done(p))
+        return future
 
     def stop(self) -> None:
         self._stop.set()
-        self._queue.put(("", "", 0))
+        self._tts_pool.shutdown(wait=False, cancel_futures=True)
+        self._queue.put(("", "", 0, 1, 0.0))
         if self._thread.is_alive():
             self._thread.join(timeout=1.5)
         try:
@@ -59,43 +115,74 @@ class AudioWorker:
     def _run(self) -> None:
         while not self._stop.is_set():
             try:
-                th_text, en_text, pause_ms = self._queue.get(timeout=0.5)
+                th_text, en_text, pause_ms, repeat, gap_sec = self._queue.get(timeout=0.5)
             except queue.Empty:
                 continue
             if self._stop.is_set():
                 break
             if not (th_text or en_text):
                 continue
-            try:
-                self._play_segment(th_text, "th")
-                if pause_ms:
-                    time.sleep(max(0, pause_ms) / 1000.0)
-                self._play_segment(en_text, "en")
-            except Exception as exc:
-                logger.error("Audio worker error: %s", exc)
+            for i in range(repeat):
+                if i and self._stop.wait(gap_sec):
+                    break
+                try:
+                    self._play_segment(th_text, "th")
+                    if pause_ms:
+                        time.sleep(max(0, pause_ms) / 1000.0)
+                    self._play_segment(en_text, "en")
+                except Exception as exc:
+                    logger.error("Audio worker error: %s", exc)
 
     def _play_segment(self, text: str, lang: str) -> None:
         if not text:
             return
         filename = self._cache_path(text, lang)
-        if not filename.exists():
-            gTTS(text=text, lang=lang).save(str(filename))
+        pending = self._prefetch_path(text, lang, filename)
+        if pending is not None:
+            pending.result(timeout=_TTS_TIMEOUT_SECONDS)
         try:
-            pygame.mixer.music.load(str(filename))
-            pygame.mixer.music.play()
-            start = time.time()
-            while pygame.mixer.music.get_busy():
-                if time.time() - start > 120:
+            sound = pygame.mixer.Sound(str(filename))
+            channel = sound.play()
+            if channel is None:
+                return
+            start = time.monotonic()
+            # The clip length is known up front: sleep through it in one wait (cut short by stop())
+            # and only poll briefly for the mixer's tail instead of waking every 100 ms.
+            self._stop.wait(min(sound.get_length(), _MAX_CLIP_SECONDS))
+            while channel.get_busy() and not self._stop.is_set():
+                if time.monotonic() - start > _MAX_CLIP_SECONDS:
                     logger.warning("Audio playback exceeded maximum duration; forcing stop")
                     break
-                time.sleep(0.1)
-            pygame.mixer.music.stop()
+                self._stop.wait(0.02)
+            channel.stop()
         except Exception as exc:  # pragma: no cover - optional audio backend
             logger.error("Playback error: %s", exc)
 
+    def _synthesize(self, text: str, lang: str, path: Path) -> None:
+        # Write beside the target and rename, so exists() never sees a half-written clip.
+        tmp = path.with_name(path.name + ".part")
+        gTTS(text=text, lang=lang).save(str(tmp))
+        os.replace(tmp, path)
+
+    def _synth_done(self, path: Path) -> None:
+        with self._lock:
+            future = self._synth_pending.pop(path, None)
+        if future is not None and not future.cancelled() and future.exception() is not None:
+            logger.warning("TTS prefetch failed for %s: %s", path.name, future.exception())
+
     def _cache_path(self, text: str, lang: str) -> Path:
-        digest = hashlib.sha256(f"{lang}:{text}".encode("utf-8")).hexdigest()
-        return self.cache_dir / f"{digest}.mp3"
+        key = f"{lang}:{text}".encode("utf-8")
+        path = self.cache_dir / f"{hashlib.blake2b(key, digest_size=16).hexdigest()}.mp3"
+        if self._legacy_names and not path.exists():
+            # Adopt a clip cached under the previous SHA-256 naming instead of re-synthesizing it.
+            legacy_name = f"{hashlib.sha256(key).hexdigest()}.mp3"
+            if legacy_name in self._legacy_names:
+                self._legacy_names.discard(legacy_name)
+                try:
+                    (self.cache_dir / legacy_name).rename(path)
+                except OSError:
+                    pass
+        return path
 
 
 __all__ = ["AudioWorker"]
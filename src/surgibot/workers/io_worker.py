@@ -1,10 +1,10 @@
 """Network/background worker utilities for SurgiBot."""
 from __future__ import annotations
 
-import queue
 import threading
 import weakref
-from typing import Any, Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
 
 import requests
 from requests.adapters import HTTPAdapter, Retry
@@ -15,12 +15,16 @@ from ..logging_setup import get_logger
 logger = get_logger(__name__)
 
 
+_POOL_SIZE = 32
+
+
 class SessionManager:
-    """Maintain a shared requests.Session with retries."""
+    """Maintain a shared requests.Session with retries and a keep-alive connection pool."""
 
     def __init__(self) -> None:
         self._lock = threading.Lock()
         self._session: Optional[requests.Session] = None
+        self._warmed: set[str] = set()
 
     def get(self) -> requests.Session:
         with self._lock:
@@ -34,44 +38,107 @@ class SessionManager:
                     status_forcelist=(429, 500, 502, 503, 504),
                     allowed_methods=frozenset(["GET", "POST"]),
                 )
-                adapter = HTTPAdapter(max_retries=retries)
+                # Every NetworkTask shares this session; the default pool of 10 discards the
+                # extra sockets under concurrency, forcing a fresh TCP connect on the next call.
+                adapter = HTTPAdapter(
+                    max_retries=retries,
+                    pool_connections=_POOL_SIZE,
+                    pool_maxsize=_POOL_SIZE,
+                    pool_block=False,
+                )
                 self._session.mount("http://", adapter)
                 self._session.mount("https://", adapter)
             return self._session
 
+    def warmup(self, url: str, timeout: Optional[float] = None) -> None:
+        """Open a pooled connection to ``url`` in the background so the first real call reuses it.
+
+        Each URL is warmed at most once per process.
+        """
+        with self._lock:
+            if url in self._warmed:
+                return
+            self._warmed.add(url)
+
+        def _touch() -> None:
+            try:
+                self.get().head(url, timeout=timeout or CONFIG.request_timeout, allow_redirects=False)
+            except requests.RequestException as exc:
+                logger.debug("Connection warmup for %s failed: %s", url, exc)
+
+        threading.Thread(target=_touch, name="surgibot-net-warmup", daemon=True).start()
+
 
 SESSION_MANAGER = SessionManager()
 
 
+_Callbacks = Tuple[Callable[[], Any], Callable[[Any], None], Callable[[BaseException], None]]
+
+
 class RequestExecutor:
-    """Execute blocking request callables in a background thread."""
+    """Execute blocking request callables on a small thread pool."""
 
-    def __init__(self) -> None:
-        self._thread = threading.Thread(target=self._run, daemon=True)
-        self._queue: "queue.Queue[tuple[Callable[[], Any], Callable[[Any], None], Callable[[BaseException], None]]]]" = queue.Queue()
-        self._thread.start()
+    def __init__(self, max_workers: int = 4) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="surgibot-net")
+        self._lock = threading.Lock()
+        # tag -> latest (fn, on_success, on_error) for a tagged task that has not started yet
+        self._queued: dict[str, _Callbacks] = {}
+        self._futures: dict[str, Future] = {}
 
     def submit(
         self,
         fn: Callable[[], Any],
         on_success: Callable[[Any], None],
         on_error: Callable[[BaseException], None],
-    ) -> None:
-        self._queue.put((fn, on_success, on_error))
+        tag: Optional[str] = None,
+    ) -> Future:
+        """Queue ``fn``; callbacks run on the worker thread.
+
+        With a ``tag``, a call made while an earlier task with the same tag is still waiting
+        to start replaces that task's callable and callbacks (the latest submission wins) and
+        shares its future. Once a tagged task has started, a new submission queues a fresh task.
+        """
+        if tag is None:
+            return self._pool.submit(self._call, fn, on_success, on_error)
+        with self._lock:
+            if tag in self._queued:
+                self._queued[tag] = (fn, on_success, on_error)
+                return self._futures[tag]
+            # _run_tagged needs the lock to pick up its entry, so it cannot start before both are set
+            future = self._pool.submit(self._run_tagged, tag)
+            self._queued[tag] = (fn, on_success, on_error)
+            self._futures[tag] = future
+        return future
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _run_tagged(self, tag: str) -> Any:
+        with self._lock:
+            fn, on_success, on_error = self._queued.pop(tag)
+            del self._futures[tag]
+        return self._call(fn, on_success, on_error)
 
-    def _run(self) -> None:
-        while True:
+    def _call(
+        self,
+        fn: Callable[[], Any],
+        on_success: Callable[[Any], None],
+        on_error: Callable[[BaseException], None],
+    ) -> Any:
+        try:
+            result = fn()
+        except Exception as exc:
+            logger.error("Request worker exception: %s", exc)
             try:
-                fn, on_success, on_error = self._queue.get()
-                try:
-                    result = fn()
-                except BaseException as exc:  # pragma: no cover - worker thread
-                    logger.error("Request worker exception: %s", exc)
-                    on_error(exc)
-                else:
-                    on_success(result)
-            except Exception as exc:  # pragma: no cover - worker thread
-                logger.error("Unexpected worker loop error: %s", exc)
+                on_error(exc)
+            except Exception as cb_exc:  # pragma: no cover - worker thread
+                logger.error("Unexpected worker callback error: %s", cb_exc)
+            raise
+        try:
+            on_success(result)
+        except Exception as cb_exc:  # pragma: no cover - worker thread
+            logger.error("Unexpected worker callback error: %s", cb_exc)
+        return result
 
 
 try:
@@ -117,4 +184,4 @@ if QtCore:
             QtCore.QTimer.singleShot(0, _deliver)
 
 
-__all__ = ["SESSION_MANAGER", "NetworkTask", "SessionManager"]
+__all__ = ["SESSION_MANAGER", "NetworkTask", "RequestExecutor", "SessionManager"]
@@ -0,0 +1,68 @@
+"""Tests for the SQLite helpers in surgibot.utils.db."""
+from __future__ import annotations
+
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from surgibot.utils import db  # noqa: E402
+
+DB_NAME = "test.db"
+
+
+class DbTransactionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(db, "CONFIG", SimpleNamespace(data_dir=Path(self._tmp.name)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with db.db_cursor(DB_NAME) as cur:
+            cur.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, name TEXT)")
+
+    def tearDown(self) -> None:
+        for conn in getattr(db._LOCAL, "conns", {}).values():
+            conn.close()
+        db._LOCAL.conns = {}
+        self._tmp.cleanup()
+
+    def _count(self) -> int:
+        # read through a separate connection so only committed rows are visible
+        with sqlite3.connect(Path(self._tmp.name) / DB_NAME) as other:
+            return other.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def test_executemany_commits_once(self) -> None:
+        with db.db_transaction(DB_NAME) as conn:
+            conn.executemany("INSERT INTO events (name) VALUES (?)", [(f"e{i}",) for i in range(50)])
+            self.assertTrue(conn.in_transaction)
+            self.assertEqual(self._count(), 0)
+        self.assertFalse(db.get_connection(DB_NAME).in_transaction)
+        self.assertEqual(self._count(), 50)
+
+    def test_rolls_back_on_error(self) -> None:
+        with self.assertRaises(RuntimeError):
+            with db.db_transaction(DB_NAME) as conn:
+                conn.executemany("INSERT INTO events (name) VALUES (?)", [("a",), ("b",)])
+                raise RuntimeError("boom")
+        self.assertEqual(self._count(), 0)
+
+    def test_nests_inside_db_cursor(self) -> None:
+        with db.db_cursor(DB_NAME) as cur:
+            cur.execute("INSERT INTO events (name) VALUES ('outer')")
+            with db.db_transaction(DB_NAME) as conn:
+                conn.executemany("INSERT INTO events (name) VALUES (?)", [("x",), ("y",)])
+            with self.assertRaises(RuntimeError):
+                with db.db_transaction(DB_NAME) as conn:
+                    conn.execute("INSERT INTO events (name) VALUES ('discarded')")
+                    raise RuntimeError("boom")
+            self.assertEqual(self._count(), 0)
+        self.assertEqual(self._count(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()